@@ -0,0 +1,268 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd
+
+import numpy as np
+
+import life.grid_operations as grid_operations
+import life.pattern_importer as pattern_importer
+
+MAX_GENERATIONS = 1000
+MAX_CELLS = 1000000  # bigger patterns are skipped
+CONWAY_RULES = ("", "b3/s23", "s23/b3", "23/3")
+CACHE_FILE = ".analysis_cache.json"  # stored in analyzed directory
+FATES = ("dies", "stabilizes", "spaceship", "grows", "unknown", "skipped")
+CACHE_VERSION = 2  # increased when results of the same file may change (e.g. importer fixes)
+
+
+def crop(grid):
+    """
+        Crop grid to bounding box of live cells
+
+        Parameters
+        ----------
+        grid : numpy.ndarray
+            2 dimensional grid
+
+        Returns
+        -------
+        cropped : numpy.ndarray
+            2 dimensional grid (shape (0, 0) if there is no live cell)
+        offset : tuple(int, int)
+            (i, j) index of cropped grid origin in given grid
+    """
+    rows = np.flatnonzero(grid.any(axis=1))
+    if len(rows) == 0:
+        return grid[:0, :0], (0, 0)
+    columns = np.flatnonzero(grid.any(axis=0))
+    return grid[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1], (rows[0], columns[0])
+
+
+def format_speed(dx, dy, period):
+    """
+        Format spaceship speed in Life notation (e.g. 'c/4', '2c/5')
+
+        Parameters
+        ----------
+        dx : int
+            horizontal displacement per period
+        dy : int
+            vertical displacement per period
+        period : int
+            number of generations
+
+        Returns
+        -------
+        speed : str
+            speed as fraction of c (one cell per generation)
+    """
+    distance = max(abs(dx), abs(dy))
+    if distance == 0:
+        return "0"
+    divisor = gcd(distance, period)
+    distance, period = distance // divisor, period // divisor
+    numerator = "c" if distance == 1 else "{}c".format(distance)
+    return numerator if period == 1 else "{}/{}".format(numerator, period)
+
+
+def characterize(pattern, max_generations=MAX_GENERATIONS):
+    """
+        Run pattern on unbounded plane and describe its evolution.
+
+        Every generation is computed only on bounding box of live cells extended by one cell,
+        so the pattern is never clipped by grid edges. Period and displacement are found
+        by comparing cropped generations with all previous ones.
+
+        Parameters
+        ----------
+        pattern : numpy.ndarray
+            2 dimensional array with pattern
+        max_generations : int
+            maximal number of simulated generations
+
+        Returns
+        -------
+        result : dict
+            fate (one of FATES), period, displacement (dx, dy), speed, population range,
+            initial and final bounding box (height, width) and number of simulated generations
+    """
+    cells, (i, j) = crop(pattern.astype(np.int32))
+    seen = {}
+    populations = []
+    result = {"fate": "unknown", "period": None, "dx": None, "dy": None, "speed": None, "stabilized_at": None,
+              "bbox_initial": list(cells.shape)}
+    for generation in range(max_generations + 1):
+        populations.append(int(cells.sum()))
+        key = (cells.shape, hashlib.blake2b(cells.tobytes(), digest_size=16).digest())
+        if key in seen:
+            first_generation, first_i, first_j = seen[key]
+            period = generation - first_generation
+            dx, dy = j - first_j, i - first_i
+            if populations[-1] == 0:
+                fate, dx, dy = "dies", 0, 0
+            elif dx == 0 and dy == 0:
+                fate = "stabilizes"
+            else:
+                fate = "spaceship"
+            result.update(fate=fate, period=period, dx=int(dx), dy=int(dy), speed=format_speed(dx, dy, period),
+                          stabilized_at=first_generation)
+            break
+        seen[key] = (generation, i, j)
+        if generation == max_generations:
+            # no cycle found, population still rising at the end of run is considered unbounded growth
+            quarter = len(populations) // 4
+            if quarter and np.mean(populations[-quarter:]) > 1.1 * np.mean(populations[-2 * quarter:-quarter]):
+                result["fate"] = "grows"
+            break
+
+        h, w = cells.shape
+        padded = np.zeros((h + 2, w + 2), dtype=np.int32)
+        padded[1:h + 1, 1:w + 1] = cells
+        cells, (di, dj) = crop(grid_operations.update_grid(padded, h + 2, w + 2))
+        if cells.size:
+            i, j = i + di - 1, j + dj - 1
+
+    result.update(population_min=min(populations), population_max=max(populations),
+                  bbox_final=list(cells.shape), generations=generation)
+    return result
+
+
+def analyze_file(rle_file, max_generations=MAX_GENERATIONS):
+    """
+        Characterize pattern from RLE-file (see 'characterize')
+
+        Parameters
+        ----------
+        rle_file : str
+            pattern RLE-file path
+        max_generations : int
+            maximal number of simulated generations
+
+        Returns
+        -------
+        result : dict
+            pattern description, fate 'skipped' with 'reason' if pattern can not be simulated
+    """
+    header = pattern_importer.read_rle_header(rle_file)
+    if header is None:
+        return {"fate": "skipped", "reason": "invalid header"}
+    x, y, rule = header
+    if rule.lower() not in CONWAY_RULES:
+        return {"fate": "skipped", "reason": "rule {}".format(rule)}
+    if x * y > MAX_CELLS:
+        return {"fate": "skipped", "reason": "size {}x{}".format(y, x)}
+    pattern = pattern_importer.import_rle(rle_file)
+    if pattern is None:
+        return {"fate": "skipped", "reason": "import error"}
+    return characterize(pattern, max_generations)
+
+
+def file_hash(path):
+    """Return SHA-1 hex digest of file content"""
+    with open(path, "rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def load_cache(cache_file):
+    """Load analysis results cache (dictionary file hash -> result)"""
+    try:
+        with open(cache_file, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, cache_file):
+    """Save analysis results cache, replacing old file only after successful write"""
+    temporary_file = cache_file + ".tmp"
+    with open(temporary_file, "w") as file:
+        json.dump(cache, file)
+    os.replace(temporary_file, cache_file)
+
+
+def analyze_library(directory, max_generations=MAX_GENERATIONS, cache_file=None, workers=None):
+    """
+        Characterize every RLE-file in directory using pool of processes.
+
+        Results are cached on disk by file content hash, so only new or changed files are simulated.
+
+        Parameters
+        ----------
+        directory : str
+            directory with RLE-files
+        max_generations : int
+            maximal number of simulated generations
+        cache_file : str or None
+            results cache path (None - CACHE_FILE in analyzed directory)
+        workers : int or None
+            number of processes (None - number of CPUs, 0 - analyze in calling process)
+
+        Returns
+        -------
+        results : list(dict)
+            pattern descriptions with 'name' of file, sorted by name
+    """
+    if cache_file is None:
+        cache_file = os.path.join(directory, CACHE_FILE)
+    cache = load_cache(cache_file)
+    files = sorted(glob.glob(os.path.join(directory, "*.rle")))
+    hashes = [file_hash(path) for path in files]
+
+    missing = {}
+    for path, key in zip(files, hashes):
+        if (key not in cache or cache[key].get("max_generations") != max_generations or
+                cache[key].get("version") != CACHE_VERSION):
+            missing.setdefault(key, path)
+
+    if missing:
+        paths = list(missing.values())
+        generations = [max_generations] * len(paths)
+        if workers == 0:
+            results = map(analyze_file, paths, generations)
+        else:
+            executor = ProcessPoolExecutor(workers)
+            results = executor.map(analyze_file, paths, generations)
+        try:
+            for key, result in zip(missing, results):
+                result["max_generations"] = max_generations
+                result["version"] = CACHE_VERSION
+                cache[key] = result
+        finally:
+            if workers != 0:
+                executor.shutdown(cancel_futures=True)
+            save_cache(cache, cache_file)
+
+    return [dict(cache[key], name=os.path.basename(path)) for path, key in zip(files, hashes)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Characterize every pattern in RLE-files directory")
+    parser.add_argument("directory", nargs="?", default=os.path.join("patterns", "RLE"))
+    parser.add_argument("-g", "--generations", type=int, default=MAX_GENERATIONS)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("-f", "--fate", choices=FATES, help="show only patterns with given fate")
+    parser.add_argument("-s", "--speed", help="show only patterns with given speed (e.g. c/4)")
+    parser.add_argument("-p", "--period", type=int, help="show only patterns with given period")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = analyze_library(args.directory, args.generations, workers=args.workers)
+    results = [result for result in results
+               if (args.fate is None or result["fate"] == args.fate) and
+               (args.speed is None or result.get("speed") == args.speed) and
+               (args.period is None or result.get("period") == args.period)]
+    if args.json:
+        print(json.dumps(results, indent=1))
+        return
+    for result in results:
+        print("{:<40} {:<10} period: {:<6} speed: {:<6} population: {}-{}".format(
+            result["name"], result["fate"], str(result.get("period")), str(result.get("speed")),
+            result.get("population_min"), result.get("population_max")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import argparse
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+
+import life.grid_operations as grid_operations
+import life.pattern_importer as pattern_importer
+
+BACKGROUND_COLOR = (255, 255, 255)
+CELL_COLOR = (23, 32, 42)  # "#17202a", the same as in game window
+FORMATS = ("gif", "apng", "pgm")
+
+
+def rasterize(grid, cell_size):
+    """
+        Convert grid to image with one palette index (0 - dead, 1 - live) per pixel
+
+        Parameters
+        ----------
+        grid : numpy.ndarray
+            2 dimensional grid
+        cell_size : int
+            grid cell size in pixels
+
+        Returns
+        -------
+        frame : numpy.ndarray
+            2 dimensional uint8 array with shape (h * cell_size, w * cell_size)
+    """
+    frame = grid.astype(np.uint8)
+    return np.repeat(np.repeat(frame, cell_size, axis=0), cell_size, axis=1)
+
+
+def lzw_encode(data, min_code_size):
+    """
+        Compress bytes with variable-length LZW used by GIF format
+
+        Parameters
+        ----------
+        data : bytes
+            palette indexes of pixels
+        min_code_size : int
+            number of bits needed for palette indexes (at least 2)
+
+        Returns
+        -------
+        out : bytes
+            LZW code stream (without sub-block framing)
+    """
+    clear_code = 1 << min_code_size
+    end_code = clear_code + 1
+    out = bytearray()
+
+    def reset():
+        return {bytes([i]): i for i in range(clear_code)}, end_code + 1, min_code_size + 1
+
+    table, next_code, code_size = reset()
+    bits, n_bits = clear_code, code_size
+    prefix = data[:1]
+    for i in range(1, len(data)):
+        word = prefix + data[i:i + 1]
+        if word in table:
+            prefix = word
+            continue
+        bits |= table[prefix] << n_bits
+        n_bits += code_size
+        if next_code < 4096:
+            table[word] = next_code
+            next_code += 1
+            if next_code > (1 << code_size) and code_size < 12:
+                code_size += 1
+        else:  # table is full
+            bits |= clear_code << n_bits
+            n_bits += code_size
+            table, next_code, code_size = reset()
+        while n_bits >= 8:
+            out.append(bits & 0xFF)
+            bits >>= 8
+            n_bits -= 8
+        prefix = data[i:i + 1]
+
+    if prefix:
+        bits |= table[prefix] << n_bits
+        n_bits += code_size
+    bits |= end_code << n_bits
+    n_bits += code_size
+    while n_bits > 0:
+        out.append(bits & 0xFF)
+        bits >>= 8
+        n_bits -= 8
+    return bytes(out)
+
+
+def encode_gif_frame(frame):
+    """Encode frame to GIF image descriptor and image data"""
+    h, w = frame.shape
+    data = lzw_encode(frame.tobytes(), 2)
+    out = bytearray(b"," + struct.pack("<4HB", 0, 0, w, h, 0) + b"\x02")
+    for i in range(0, len(data), 255):
+        block = data[i:i + 255]
+        out += bytes([len(block)]) + block
+    out += b"\x00"
+    return bytes(out)
+
+
+def encode_png_frame(frame):
+    """Encode frame to compressed PNG scanlines (filter type 0)"""
+    h, w = frame.shape
+    scanlines = np.zeros((h, w + 1), dtype=np.uint8)
+    scanlines[:, 1:] = frame
+    return zlib.compress(scanlines.tobytes(), 6)
+
+
+def encode_pgm_frame(frame):
+    """Encode frame to binary PGM image (live cells are black)"""
+    h, w = frame.shape
+    header = "P5\n{} {}\n255\n".format(w, h).encode("ascii")
+    return header + np.where(frame == 1, 0, 255).astype(np.uint8).tobytes()
+
+
+class GifWriter:
+    """Animated GIF-file writer, frames are encoded with 'encode_gif_frame'"""
+
+    def __init__(self, path, shape, frames, delay):
+        h, w = shape
+        self.file = open(path, "wb")
+        self.delay = max(1, delay // 10)  # centiseconds
+        self.file.write(b"GIF89a" + struct.pack("<2H3B", w, h, 0xF0, 0, 0))
+        self.file.write(bytes(BACKGROUND_COLOR + CELL_COLOR))
+        self.file.write(b"!\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")  # infinite loop
+
+    def write(self, data):
+        self.file.write(b"!\xf9\x04\x00" + struct.pack("<H", self.delay) + b"\x00\x00")
+        self.file.write(data)
+
+    def close(self):
+        self.file.write(b";")
+        self.file.close()
+
+
+class ApngWriter:
+    """Animated PNG-file writer, frames are encoded with 'encode_png_frame'"""
+
+    def __init__(self, path, shape, frames, delay):
+        self.h, self.w = shape
+        self.file = open(path, "wb")
+        self.delay = delay  # milliseconds
+        self.sequence = 0
+        self.file.write(b"\x89PNG\r\n\x1a\n")
+        self.write_chunk(b"IHDR", struct.pack(">2I5B", self.w, self.h, 8, 3, 0, 0, 0))
+        self.write_chunk(b"acTL", struct.pack(">2I", frames, 0))
+        self.write_chunk(b"PLTE", bytes(BACKGROUND_COLOR + CELL_COLOR))
+
+    def write_chunk(self, chunk_type, data):
+        self.file.write(struct.pack(">I", len(data)) + chunk_type + data)
+        self.file.write(struct.pack(">I", zlib.crc32(chunk_type + data)))
+
+    def write(self, data):
+        self.write_chunk(b"fcTL", struct.pack(">5I2H2B", self.sequence, self.w, self.h, 0, 0,
+                                              self.delay, 1000, 0, 0))
+        if self.sequence == 0:
+            self.sequence += 1
+            self.write_chunk(b"IDAT", data)
+        else:
+            self.write_chunk(b"fdAT", struct.pack(">I", self.sequence + 1) + data)
+            self.sequence += 2
+
+    def close(self):
+        self.write_chunk(b"IEND", b"")
+        self.file.close()
+
+
+class FrameSequenceWriter:
+    """Writer storing every frame (encoded with 'encode_pgm_frame') in separate file of directory"""
+
+    def __init__(self, path, shape, frames, delay):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.index = 0
+
+    def write(self, data):
+        with open(os.path.join(self.path, "frame_{:06d}.pgm".format(self.index)), "wb") as file:
+            file.write(data)
+        self.index += 1
+
+    def close(self):
+        pass
+
+
+ENCODERS = {"gif": encode_gif_frame, "apng": encode_png_frame, "pgm": encode_pgm_frame}
+WRITERS = {"gif": GifWriter, "apng": ApngWriter, "pgm": FrameSequenceWriter}
+
+
+def export_run(grid, path, generations, fmt="gif", cell_size=4, delay=100, generations_per_frame=1, workers=None):
+    """
+        Run simulation and stream its frames to animation file (or frame sequence directory).
+
+        Simulation runs in calling process, frames are encoded by a pool of worker processes.
+        Only a bounded number of frames is waiting for encoding, so memory use does not depend on run length.
+
+        Parameters
+        ----------
+        grid : numpy.ndarray
+            2 dimensional grid with initial state
+        path : str
+            output file path ('pgm' format - output directory)
+        generations : int
+            number of generations to simulate
+        fmt : str
+            output format, one of FORMATS
+        cell_size : int
+            grid cell size in pixels
+        delay : int
+            time between frames in milliseconds
+        generations_per_frame : int
+            number of generations between two frames
+        workers : int or None
+            number of encoding processes (None - number of CPUs, 0 - encode in calling process)
+
+        Returns
+        -------
+        frames : int
+            number of written frames
+    """
+    if fmt not in FORMATS:
+        raise ValueError("Unknown format '{}', expected one of {}".format(fmt, FORMATS))
+    encode = ENCODERS[fmt]
+    frames = generations // generations_per_frame + 1
+    h, w = grid.shape
+    writer = WRITERS[fmt](path, (h * cell_size, w * cell_size), frames, delay)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    executor = ProcessPoolExecutor(workers) if workers > 0 else None
+    max_pending = 2 * max(workers, 1)
+    pending = deque()
+    try:
+        for i in range(frames):
+            if i > 0:
+                grid = grid_operations.step(grid, generations_per_frame)
+            frame = rasterize(grid, cell_size)
+            if executor is not None:
+                pending.append(executor.submit(encode, frame))
+            else:
+                pending.append(Future())
+                pending[-1].set_result(encode(frame))
+            if len(pending) >= max_pending:
+                writer.write(pending.popleft().result())
+        while pending:
+            writer.write(pending.popleft().result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        writer.close()
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export Game of Life run to animation without opening a window")
+    parser.add_argument("output", help="output file (.gif, .png/.apng) or directory for PGM frame sequence")
+    parser.add_argument("-p", "--pattern", help="RLE pattern file (random grid if not given)")
+    parser.add_argument("-g", "--generations", type=int, default=100)
+    parser.add_argument("-s", "--size", type=int, nargs=2, default=(100, 100), metavar=("H", "W"),
+                        help="grid size (for pattern - minimal grid size, pattern is centered)")
+    parser.add_argument("-c", "--cell-size", type=int, default=4)
+    parser.add_argument("-d", "--delay", type=int, default=100, help="time between frames in milliseconds")
+    parser.add_argument("-n", "--generations-per-frame", type=int, default=1)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    h, w = args.size
+    if args.pattern is None:
+        grid = grid_operations.create_random_grid(h, w)
+    else:
+        pattern = pattern_importer.import_rle(args.pattern)
+        if pattern is None:
+            parser.error("There was error during importing file:\n{}".format(args.pattern))
+        h, w = max(h, pattern.shape[0]), max(w, pattern.shape[1])
+        grid = grid_operations.create_empty_grid(h, w)
+        grid_operations.insert_pattern_into_grid(pattern, grid, ((w - pattern.shape[1]) // 2,
+                                                                 (h - pattern.shape[0]) // 2))
+
+    extension = os.path.splitext(args.output)[1].lower()
+    fmt = {".gif": "gif", ".png": "apng", ".apng": "apng"}.get(extension, "pgm")
+    frames = export_run(grid, args.output, args.generations, fmt, args.cell_size, args.delay,
+                        args.generations_per_frame, args.workers)
+    print("{} frames written to {}".format(frames, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 import numpy as np
 from numba import jit
 
+TILE_SIZE = 128  # tile edge (cells) processed by 'step', tile with halos should fit in L1/L2 cache
+STEP_DEPTH = 8  # generations computed per one pass over the grid (halo width)
+
 
 @jit
 def create_random_grid(h, w):
@@ -74,6 +77,24 @@ def is_empty(grid):
     return not grid.any()
 
 
+@jit
+def count_population(grid):
+    """
+        Count live cells in grid.
+
+        Parameters
+        ----------
+        grid : numpy.ndarray
+            2 dimensional grid
+
+        Returns
+        -------
+        n : int
+            number of live cells
+    """
+    return grid.sum()
+
+
 @jit
 def count_neighbours(grid, i, j, h, w):
     """
@@ -155,6 +176,87 @@ def update_grid(grid, h, w):
     return next_grid
 
 
+@jit
+def step(grid, n, tile_size=TILE_SIZE, depth=STEP_DEPTH):
+    """
+        Compute grid after n generations following the Conway's rules.
+
+        The result is identical to n calls of 'update_grid', but the grid is processed in tiles:
+        every tile is copied with a halo of 'depth' cells into a small buffer, which is advanced
+        'depth' generations before the tile interior is written back. Every pass over the grid
+        computes 'depth' generations instead of one.
+
+        Parameters
+        ----------
+        grid : numpy.ndarray
+            2 dimensional grid
+        n : int
+            number of generations
+        tile_size : int
+            tile edge in cells
+        depth : int
+            maximal number of generations computed in one pass (halo width)
+
+        Returns
+        -------
+        next_grid : numpy.ndarray
+            2 dimensional grid after n periods
+    """
+    h, w = grid.shape
+    size = tile_size + 2 * depth
+    buffer = np.zeros((size, size), dtype=np.int32)
+    next_buffer = np.zeros((size, size), dtype=np.int32)
+
+    while n > 0 and not is_empty(grid):
+        k = depth if n > depth else n
+        next_grid = np.zeros((h, w), dtype=np.int32)
+        for y0 in range(0, h, tile_size):
+            for x0 in range(0, w, tile_size):
+                # load tile with halo, cells outside grid stay dead
+                buffer.fill(0)
+                next_buffer.fill(0)
+                i_min = y0 - k if y0 > k else 0
+                j_min = x0 - k if x0 > k else 0
+                i_max = y0 + tile_size + k if y0 + tile_size + k < h else h
+                j_max = x0 + tile_size + k if x0 + tile_size + k < w else w
+                for i in range(i_min, i_max):
+                    for j in range(j_min, j_max):
+                        buffer[i - y0 + k, j - x0 + k] = grid[i, j]
+
+                # local indexes of cells inside grid
+                li_min, li_max = i_min - y0 + k, i_max - y0 + k
+                lj_min, lj_max = j_min - x0 + k, j_max - x0 + k
+
+                # valid area shrinks by one cell per generation
+                for g in range(1, k + 1):
+                    ii_min = g if g > li_min else li_min
+                    ii_max = size - g if size - g < li_max else li_max
+                    jj_min = g if g > lj_min else lj_min
+                    jj_max = size - g if size - g < lj_max else lj_max
+                    for i in range(ii_min, ii_max):
+                        for j in range(jj_min, jj_max):
+                            neighbours = (buffer[i - 1, j - 1] + buffer[i - 1, j] + buffer[i - 1, j + 1] +
+                                          buffer[i, j - 1] + buffer[i, j + 1] +
+                                          buffer[i + 1, j - 1] + buffer[i + 1, j] + buffer[i + 1, j + 1])
+                            if (buffer[i, j] == 1 and (neighbours == 2 or neighbours == 3)) or \
+                                    (buffer[i, j] == 0 and neighbours == 3):
+                                next_buffer[i, j] = 1
+                            else:
+                                next_buffer[i, j] = 0
+                    buffer, next_buffer = next_buffer, buffer
+
+                # store tile interior
+                i_max = y0 + tile_size if y0 + tile_size < h else h
+                j_max = x0 + tile_size if x0 + tile_size < w else w
+                for i in range(y0, i_max):
+                    for j in range(x0, j_max):
+                        next_grid[i, j] = buffer[i - y0 + k, j - x0 + k]
+        grid = next_grid
+        n -= k
+
+    return grid
+
+
 def mouse_to_grid_position(position, cell_size):
     """
         Convert mouse pixel position to grid index
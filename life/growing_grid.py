@@ -0,0 +1,202 @@
+import numpy as np
+
+import life.grid_operations as grid_operations
+
+MARGIN = grid_operations.STEP_DEPTH  # dead cells kept around live cells after reallocation
+SHRINK_RATIO = 4  # allocation shrinks when live extent (with margin) is this many times smaller
+
+
+class GrowingGrid:
+    """
+        Dense grid on unbounded plane.
+
+        Cells are stored in 'cells' array, whose [0, 0] element has 'offset' index on the plane.
+        When live cells reach the array border, the array is reallocated with doubled size,
+        so patterns are never clipped. When live extent contracts, the array shrinks
+        (not below its initial shape) and live cells are recentred.
+
+        Parameters
+        ----------
+        h : int
+            initial (and minimal) grid height
+        w : int
+            initial (and minimal) grid width
+        grid : numpy.ndarray or None
+            initial state with shape (h, w) placed at plane origin
+    """
+
+    def __init__(self, h, w, grid=None):
+        self.min_shape = (h, w)
+        self.cells = grid_operations.create_empty_grid(h, w)
+        self.offset = (0, 0)
+        self.generation = 0
+        if grid is not None:
+            self.cells[:, :] = grid
+
+    @property
+    def shape(self):
+        return self.cells.shape
+
+    def population(self):
+        """Return number of live cells"""
+        return int(grid_operations.count_population(self.cells))
+
+    def bounding_box(self):
+        """
+            Find extent of live cells
+
+            Returns
+            -------
+            bbox : tuple(int, int, int, int) or None
+                (i_min, j_min, i_max, j_max) plane indexes (max exclusive), None if there is no live cell
+        """
+        rows = np.flatnonzero(self.cells.any(axis=1))
+        if len(rows) == 0:
+            return None
+        columns = np.flatnonzero(self.cells.any(axis=0))
+        i, j = self.offset
+        return int(i + rows[0]), int(j + columns[0]), int(i + rows[-1] + 1), int(j + columns[-1] + 1)
+
+    def reallocate(self, shape, offset):
+        """Move cells to new array with given shape and plane offset (cells outside it are lost)"""
+        cells = grid_operations.create_empty_grid(*shape)
+        (h, w), (i, j) = self.cells.shape, self.offset
+        i_min, j_min = max(i, offset[0]), max(j, offset[1])
+        i_max, j_max = min(i + h, offset[0] + shape[0]), min(j + w, offset[1] + shape[1])
+        if i_min < i_max and j_min < j_max:
+            cells[i_min - offset[0]:i_max - offset[0], j_min - offset[1]:j_max - offset[1]] = \
+                self.cells[i_min - i:i_max - i, j_min - j:j_max - j]
+        self.cells, self.offset = cells, offset
+
+    def reserve(self, i_min, j_min, i_max, j_max):
+        """
+            Make sure plane rectangle is allocated, every too small dimension is (at least) doubled
+
+            Parameters
+            ----------
+            i_min, j_min, i_max, j_max : int
+                plane rectangle (max exclusive)
+        """
+        shape, offset = [], []
+        for low, high, start, size in ((i_min, i_max, self.offset[0], self.shape[0]),
+                                       (j_min, j_max, self.offset[1], self.shape[1])):
+            if start <= low and high <= start + size:
+                shape.append(size)
+                offset.append(start)
+                continue
+            low, high = min(low, start), max(high, start + size)
+            new_size = max(2 * size, high - low)
+            extra = new_size - (high - low)
+            if low < start and high > start + size:  # grow in both directions
+                low -= extra // 2
+            elif low < start:  # grow towards lower indexes
+                low -= extra
+            shape.append(new_size)
+            offset.append(low)
+        if tuple(shape) != self.shape or tuple(offset) != self.offset:
+            self.reallocate(tuple(shape), tuple(offset))
+
+    def shrink(self):
+        """Reallocate smaller array around live cells if they occupy small part of current one"""
+        bbox = self.bounding_box()
+        if bbox is None:
+            return
+        shape, offset = [], []
+        for low, high, start, size, min_size in ((bbox[0], bbox[2], self.offset[0], self.shape[0], self.min_shape[0]),
+                                                 (bbox[1], bbox[3], self.offset[1], self.shape[1], self.min_shape[1])):
+            extent = high - low + 2 * MARGIN
+            if size > min_size and SHRINK_RATIO * extent <= size:
+                new_size = max(min_size, 2 * extent)
+                shape.append(new_size)
+                offset.append((low + high - new_size) // 2)  # recentre
+            else:
+                shape.append(size)
+                offset.append(start)
+        if tuple(shape) != self.shape:
+            self.reallocate(tuple(shape), tuple(offset))
+
+    def clear(self):
+        """Kill all cells and return to initial shape"""
+        self.cells = grid_operations.create_empty_grid(*self.min_shape)
+        self.offset = (0, 0)
+
+    def insert_pattern(self, pattern, i, j):
+        """
+            Insert pattern (with its dead cells) at plane index, growing grid if needed
+
+            Parameters
+            ----------
+            pattern : numpy.ndarray
+                2 dimensional array with pattern
+            i : int
+                vertical plane index of pattern origin
+            j : int
+                horizontal plane index of pattern origin
+        """
+        h, w = pattern.shape
+        self.reserve(i, j, i + h, j + w)
+        i, j = i - self.offset[0], j - self.offset[1]
+        self.cells[i:i + h, j:j + w] = pattern
+
+    def set_cell(self, i, j, value):
+        """Set cell value (0 - dead, 1 - live) at plane index"""
+        (oi, oj), (h, w) = self.offset, self.shape
+        if value == 0 and not (oi <= i < oi + h and oj <= j < oj + w):
+            return  # cells outside allocated array are already dead
+        self.insert_pattern(np.full((1, 1), value, dtype=np.int32), i, j)
+
+    def viewport(self, i, j, h, w):
+        """
+            Copy plane rectangle to dense grid
+
+            Parameters
+            ----------
+            i, j : int
+                plane index of rectangle origin
+            h, w : int
+                rectangle height and width
+
+            Returns
+            -------
+            grid : numpy.ndarray
+                2 dimensional grid with shape (h, w)
+        """
+        grid = grid_operations.create_empty_grid(h, w)
+        (oi, oj), (ch, cw) = self.offset, self.shape
+        i_min, j_min = max(i, oi), max(j, oj)
+        i_max, j_max = min(i + h, oi + ch), min(j + w, oj + cw)
+        if i_min < i_max and j_min < j_max:
+            grid[i_min - i:i_max - i, j_min - j:j_max - j] = self.cells[i_min - oi:i_max - oi, j_min - oj:j_max - oj]
+        return grid
+
+    def step(self, n=1):
+        """
+            Advance grid n generations on unbounded plane.
+
+            Grid grows before live cells reach its border. Generations are computed with 'step' kernel
+            on live extent in batches as long as the distance between live cells and the border allows.
+
+            Parameters
+            ----------
+            n : int
+                number of generations
+        """
+        while n > 0:
+            bbox = self.bounding_box()
+            if bbox is None:
+                self.generation += n
+                return
+            i, j = self.offset
+            h, w = self.shape
+            margin = min(bbox[0] - i, bbox[1] - j, i + h - bbox[2], j + w - bbox[3])
+            if margin < 1:
+                self.reserve(bbox[0] - MARGIN, bbox[1] - MARGIN, bbox[2] + MARGIN, bbox[3] + MARGIN)
+                continue
+            # only live extent with k cells around it is computed
+            k = min(n, margin)
+            i_min, j_min = bbox[0] - k - i, bbox[1] - k - j
+            i_max, j_max = bbox[2] + k - i, bbox[3] + k - j
+            self.cells[i_min:i_max, j_min:j_max] = grid_operations.step(self.cells[i_min:i_max, j_min:j_max], k)
+            self.generation += k
+            n -= k
+        self.shrink()
@@ -0,0 +1,174 @@
+import cProfile
+import csv
+import functools
+import json
+import pstats
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+PHASES = ("events", "step", "render")
+FIELDS = ("generation",) + PHASES + ("population", "alloc_bytes", "alloc_peak")
+
+
+class Instrumentation:
+    """
+        Per-generation metrics recorder.
+
+        Every generation is opened with 'start_generation', its phases are timed with 'measure'
+        and it is closed with 'end_generation', which stores a record and passes it to all registered hooks.
+        Generation which was not computed (e.g. paused simulation) is just not closed,
+        the next 'start_generation' discards its timings.
+
+        Parameters
+        ----------
+        track_allocations : bool
+            if true, net and peak traced memory (tracemalloc) is recorded for every generation
+        max_records : int or None
+            number of most recent records kept in memory (None - keep all)
+    """
+
+    def __init__(self, track_allocations=False, max_records=None):
+        self.track_allocations = track_allocations
+        self.records = deque(maxlen=max_records)
+        self.hooks = []
+        self.profiler = None
+        self.generation = 0
+        self._timings = {}
+        self._memory_start = 0
+
+    def add_hook(self, hook):
+        """
+            Register callback called with every finished generation record
+
+            Parameters
+            ----------
+            hook : callable
+                function taking one argument - record dictionary with FIELDS keys
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """Unregister callback added with 'add_hook'"""
+        self.hooks.remove(hook)
+
+    def start_generation(self):
+        """Reset phase timers (and memory counters) before new generation"""
+        self._timings = dict.fromkeys(PHASES, 0.0)
+        if self.track_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._memory_start = tracemalloc.get_traced_memory()[0]
+
+    @contextmanager
+    def measure(self, phase):
+        """
+            Context manager adding time spent inside it to given phase of current generation
+
+            Parameters
+            ----------
+            phase : str
+                phase name (one of PHASES)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._timings[phase] = self._timings.get(phase, 0.0) + time.perf_counter() - start
+
+    def end_generation(self, population):
+        """
+            Store record of current generation and pass it to hooks
+
+            Parameters
+            ----------
+            population : int
+                number of live cells after current generation
+
+            Returns
+            -------
+            record : dict
+                generation metrics (times in seconds, memory in bytes)
+        """
+        self.generation += 1
+        record = dict.fromkeys(FIELDS, 0)
+        record.update(self._timings)
+        record["generation"] = self.generation
+        record["population"] = int(population)
+        if self.track_allocations and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            record["alloc_bytes"] = current - self._memory_start
+            record["alloc_peak"] = peak - self._memory_start
+        self.records.append(record)
+        for hook in self.hooks:
+            hook(record)
+        return record
+
+    def last(self):
+        """Return last stored record (None if there is no record yet)"""
+        return self.records[-1] if self.records else None
+
+    def profile(self, func):
+        """
+            Wrap function so that every call of it runs under shared cProfile profiler
+
+            Parameters
+            ----------
+            func : callable
+                function to profile (e.g. 'update_grid' or 'draw_grid')
+
+            Returns
+            -------
+            wrapper : callable
+                profiled function with the same signature
+        """
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self.profiler.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.profiler.disable()
+
+        return wrapper
+
+    def print_stats(self, sort="cumulative", limit=20):
+        """Print statistics collected by profiled functions"""
+        if self.profiler is not None:
+            pstats.Stats(self.profiler).sort_stats(sort).print_stats(limit)
+
+    def dump_stats(self, stats_file):
+        """Save statistics collected by profiled functions (readable with pstats / snakeviz)"""
+        if self.profiler is not None:
+            self.profiler.dump_stats(stats_file)
+
+    def export_csv(self, csv_file):
+        """
+            Export stored records to CSV-file
+
+            Parameters
+            ----------
+            csv_file : str
+                output file path
+        """
+        with open(csv_file, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(self.records)
+
+    def export_json(self, json_file):
+        """
+            Export stored records to JSON-file
+
+            Parameters
+            ----------
+            json_file : str
+                output file path
+        """
+        with open(json_file, "w") as file:
+            json.dump(list(self.records), file, indent=1)
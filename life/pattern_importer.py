@@ -57,6 +57,35 @@ def import_rle(rle_file):
     return pattern
 
 
+def read_rle_header(rle_file):
+    """
+        Read pattern size and rule from RLE-file header without parsing cells
+
+        Parameters
+        ----------
+        rle_file : str
+            pattern RLE-file pattern
+
+        Returns
+        -------
+        header : tuple(int, int, str) or None
+            pattern width, height and rule (empty string if not specified), None if there is no valid header
+    """
+    try:
+        with open(rle_file, "r", errors="replace") as file:
+            for line in file:
+                if line.startswith("#"):  # comment line
+                    continue
+                elif line.lower().startswith("x"):  # size line
+                    words = dict(word.split("=", 1) for word in line.replace(" ", "").strip().split(",") if "=" in word)
+                    words = {key.lower(): value for key, value in words.items()}
+                    return int(words["x"]), int(words["y"]), words.get("rule", "")
+                break
+    except (OSError, KeyError, ValueError):
+        pass
+    return None
+
+
 def parse_rle_line(pattern, line, index, digits):
     """
         Parse line from RLE-file
@@ -74,8 +103,8 @@ def parse_rle_line(pattern, line, index, digits):
     """
     (i, j) = index
     for char in line:
-        if char == "$":  # next line
-            i += 1
+        if char == "$":  # next line (or more if preceded by counter)
+            i += parse_rle_digits(digits)
             j = 0
             digits = ""
         elif char == "!":  # end of rle file
@@ -0,0 +1,120 @@
+import glob
+import os
+import re
+
+import numpy as np
+
+import life.pattern_importer as pattern_importer
+
+MAX_THUMBNAIL_CELLS = 4000000  # bigger patterns are not parsed for thumbnails
+SIZE_QUERY = re.compile(r"^(\d+)x(\d+)$")
+
+
+def build_index(directory):
+    """
+        Build index of RLE-files in directory reading only their headers
+
+        Parameters
+        ----------
+        directory : str
+            directory with RLE-files
+
+        Returns
+        -------
+        index : list(dict)
+            entries with pattern 'name', 'path', 'height' and 'width', sorted by name
+    """
+    index = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.rle"))):
+        header = pattern_importer.read_rle_header(path)
+        if header is not None:
+            width, height, rule = header
+            name = os.path.splitext(os.path.basename(path))[0]
+            index.append({"name": name, "path": path, "height": height, "width": width})
+    return index
+
+
+def search(index, query):
+    """
+        Find index entries matching query
+
+        Query is split into words. Word 'HxW' (e.g. '50x100') matches patterns not bigger than H x W cells,
+        any other word has to be a part of pattern name (case insensitive).
+
+        Parameters
+        ----------
+        index : list(dict)
+            index built with 'build_index'
+        query : str
+            search query
+
+        Returns
+        -------
+        entries : list(dict)
+            matching entries in index order
+    """
+    max_height = max_width = None
+    words = []
+    for word in query.lower().split():
+        size = SIZE_QUERY.match(word)
+        if size is not None:
+            max_height, max_width = int(size.group(1)), int(size.group(2))
+        else:
+            words.append(word)
+    return [entry for entry in index
+            if all(word in entry["name"].lower() for word in words) and
+            (max_height is None or entry["height"] <= max_height) and
+            (max_width is None or entry["width"] <= max_width)]
+
+
+def render_thumbnail(pattern, size):
+    """
+        Scale pattern to fit size x size pixels.
+        Bigger patterns are reduced (pixel is live if any cell in its block is live),
+        smaller ones are enlarged by integer factor.
+
+        Parameters
+        ----------
+        pattern : numpy.ndarray
+            2 dimensional array with pattern
+        size : int
+            maximal thumbnail edge in pixels
+
+        Returns
+        -------
+        thumbnail : numpy.ndarray
+            2 dimensional uint8 array (0 - dead, 1 - live)
+    """
+    h, w = pattern.shape
+    edge = max(h, w, 1)
+    if edge > size:
+        block = -(-edge // size)  # ceil
+        padded = np.zeros((-(-h // block) * block, -(-w // block) * block), dtype=np.uint8)
+        padded[:h, :w] = pattern
+        return padded.reshape(padded.shape[0] // block, block, padded.shape[1] // block, block).max(axis=(1, 3))
+    scale = size // edge
+    return np.repeat(np.repeat(pattern.astype(np.uint8), scale, axis=0), scale, axis=1)
+
+
+def load_thumbnail(entry, size):
+    """
+        Parse pattern of index entry and render its thumbnail
+
+        Parameters
+        ----------
+        entry : dict
+            index entry
+        size : int
+            maximal thumbnail edge in pixels
+
+        Returns
+        -------
+        thumbnail : numpy.ndarray or None
+            thumbnail (see 'render_thumbnail'), None if pattern is too big or can not be imported
+    """
+    if entry["height"] * entry["width"] > MAX_THUMBNAIL_CELLS:
+        return None
+    pattern = pattern_importer.import_rle(entry["path"])
+    if pattern is None:
+        return None
+    return render_thumbnail(pattern, size)
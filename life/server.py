@@ -0,0 +1,315 @@
+import argparse
+import asyncio
+import struct
+import zlib
+
+import numpy as np
+
+import life.grid_operations as grid_operations
+import life.pattern_importer as pattern_importer
+
+HOST = "127.0.0.1"
+PORT = 7777
+KEYFRAME_INTERVAL = 100  # generations between keyframes sent to every client
+QUEUE_SIZE = 16  # frames waiting for slow client before they are dropped
+CLOSE_TIMEOUT = 5  # seconds given to clients to receive remaining frames after simulation ends
+
+KEYFRAME = b"K"
+DELTA = b"D"
+HEADER = struct.Struct(">cQIII")  # kind, generation, height, width, payload length
+
+
+def encode_keyframe(grid, generation):
+    """
+        Encode whole grid as keyframe (zlib compressed bitmap)
+
+        Parameters
+        ----------
+        grid : numpy.ndarray
+            2 dimensional grid
+        generation : int
+            generation number
+
+        Returns
+        -------
+        frame : bytes
+            frame header and payload
+    """
+    h, w = grid.shape
+    payload = zlib.compress(np.packbits(grid != 0).tobytes())
+    return HEADER.pack(KEYFRAME, generation, h, w, len(payload)) + payload
+
+
+def encode_delta(previous_grid, grid, generation):
+    """
+        Encode cells flipped between two generations as delta frame
+        (zlib compressed differences of flipped cell flat indexes)
+
+        Parameters
+        ----------
+        previous_grid : numpy.ndarray
+            2 dimensional grid in previous generation
+        grid : numpy.ndarray
+            2 dimensional grid in current generation
+        generation : int
+            current generation number
+
+        Returns
+        -------
+        frame : bytes
+            frame header and payload
+    """
+    h, w = grid.shape
+    flipped = np.flatnonzero(previous_grid != grid)
+    payload = zlib.compress(np.diff(flipped, prepend=0).astype("<u4").tobytes())
+    return HEADER.pack(DELTA, generation, h, w, len(payload)) + payload
+
+
+async def read_frame(reader):
+    """
+        Read and decode one frame from stream
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            server connection stream
+
+        Returns
+        -------
+        frame : tuple(bytes, int, numpy.ndarray)
+            kind (KEYFRAME or DELTA), generation and decoded payload - grid for keyframe,
+            flat indexes of flipped cells for delta
+    """
+    kind, generation, h, w, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+    payload = zlib.decompress(await reader.readexactly(length))
+    if kind == KEYFRAME:
+        cells = np.unpackbits(np.frombuffer(payload, dtype=np.uint8), count=h * w)
+        return kind, generation, cells.reshape(h, w).astype(np.int32)
+    return kind, generation, np.cumsum(np.frombuffer(payload, dtype="<u4"), dtype=np.int64)
+
+
+def apply_frame(grid, frame):
+    """
+        Apply decoded frame to grid
+
+        Parameters
+        ----------
+        grid : numpy.ndarray or None
+            2 dimensional grid (None before first keyframe)
+        frame : tuple(bytes, int, numpy.ndarray)
+            frame returned by 'read_frame'
+
+        Returns
+        -------
+        grid : numpy.ndarray or None
+            grid after frame (delta frames are applied in place)
+    """
+    kind, generation, data = frame
+    if kind == KEYFRAME:
+        return data
+    if grid is not None:
+        grid.flat[data] ^= 1
+    return grid
+
+
+class Client:
+    """Connected viewer with bounded queue of frames waiting for sending"""
+
+    def __init__(self, writer, queue_size):
+        self.writer = writer
+        self.queue = asyncio.Queue(queue_size)
+        self.task = asyncio.current_task()
+        self.needs_keyframe = True
+        self.dropped = 0
+
+
+class LifeServer:
+    """
+        Server running simulation once and streaming its generations to all connected clients.
+
+        Every client gets keyframe first, then delta frames and periodic keyframes.
+        If client does not read fast enough and its queue is full, queued frames are dropped
+        and client is resynchronized with next keyframe.
+
+        Parameters
+        ----------
+        grid : numpy.ndarray
+            2 dimensional grid with initial state
+        gps : float
+            generations per second (0 - as fast as possible)
+        keyframe_interval : int
+            generations between keyframes
+        queue_size : int
+            maximal number of frames queued for one client (at least 2)
+        close_timeout : float
+            seconds given to clients to receive remaining frames after simulation ends,
+            connections of clients which do not read them in time are aborted
+    """
+
+    def __init__(self, grid, gps=10, keyframe_interval=KEYFRAME_INTERVAL, queue_size=QUEUE_SIZE,
+                 close_timeout=CLOSE_TIMEOUT):
+        self.grid = grid
+        self.gps = gps
+        self.keyframe_interval = keyframe_interval
+        self.queue_size = max(2, queue_size)
+        self.close_timeout = close_timeout
+        self.generation = 0
+        self.clients = set()
+
+    async def handle_client(self, reader, writer):
+        """Send queued frames to client until it disconnects or simulation ends"""
+        client = Client(writer, self.queue_size)
+        self.clients.add(client)
+        try:
+            while True:
+                frame = await client.queue.get()
+                if frame is None:  # end of simulation
+                    break
+                writer.write(frame)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            writer.close()
+
+    def broadcast(self, previous_grid):
+        """Queue current generation for every client (delta, or keyframe if needed)"""
+        keyframe = delta = None
+        periodic = self.generation % self.keyframe_interval == 0
+        for client in self.clients:
+            if client.queue.full():  # slow client, drop queued frames
+                while not client.queue.empty():
+                    client.queue.get_nowait()
+                    client.dropped += 1
+                client.needs_keyframe = True
+            if client.needs_keyframe or periodic or previous_grid is None:
+                if keyframe is None:
+                    keyframe = encode_keyframe(self.grid, self.generation)
+                client.queue.put_nowait(keyframe)
+                client.needs_keyframe = False
+            else:
+                if delta is None:
+                    delta = encode_delta(previous_grid, self.grid, self.generation)
+                client.queue.put_nowait(delta)
+
+    def finish(self):
+        """Queue end of stream for every client (after frames already queued)"""
+        for client in self.clients:
+            if client.queue.full():  # resynchronize slow client with last generation
+                while not client.queue.empty():
+                    client.queue.get_nowait()
+                    client.dropped += 1
+                client.queue.put_nowait(encode_keyframe(self.grid, self.generation))
+            client.queue.put_nowait(None)
+
+    async def run(self, generations=None):
+        """
+            Run simulation (forever if generations is None)
+
+            Parameters
+            ----------
+            generations : int or None
+                number of generations to compute
+        """
+        h, w = self.grid.shape
+        self.broadcast(None)
+        while generations is None or self.generation < generations:
+            await asyncio.sleep(1 / self.gps if self.gps else 0)
+            previous_grid = self.grid
+            self.grid = grid_operations.update_grid(self.grid, h, w)
+            self.generation += 1
+            self.broadcast(previous_grid)
+
+    async def serve(self, unix_path=None, host=HOST, port=PORT, generations=None):
+        """
+            Accept clients on Unix socket (if path given) or localhost TCP port and run simulation
+
+            Parameters
+            ----------
+            unix_path : str or None
+                Unix socket path
+            host : str
+                TCP host (used if unix_path is None)
+            port : int
+                TCP port (used if unix_path is None)
+            generations : int or None
+                number of generations to compute (None - run forever)
+        """
+        if unix_path is not None:
+            server = await asyncio.start_unix_server(self.handle_client, unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await self.run(generations)
+            clients = list(self.clients)
+            self.finish()
+            if not clients:
+                return
+            done, pending = await asyncio.wait([client.task for client in clients], timeout=self.close_timeout)
+            for client in clients:
+                if client.task in pending:  # stalled client (e.g. not reading from socket)
+                    client.writer.transport.abort()
+                    client.task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+
+async def watch(reader):
+    """
+        Asynchronous generator of grids received from server
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            server connection stream
+
+        Yields
+        ------
+        generation : int
+            generation number
+        grid : numpy.ndarray
+            2 dimensional grid (the same array is updated in place by delta frames)
+    """
+    grid = None
+    while True:
+        try:
+            frame = await read_frame(reader)
+        except asyncio.IncompleteReadError:
+            return
+        grid = apply_frame(grid, frame)
+        if grid is not None:
+            yield frame[1], grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Game of Life once and stream it to connected viewers")
+    parser.add_argument("-p", "--pattern", help="RLE pattern file (random grid if not given)")
+    parser.add_argument("-s", "--size", type=int, nargs=2, default=(100, 100), metavar=("H", "W"))
+    parser.add_argument("--gps", type=float, default=10, help="generations per second (0 - as fast as possible)")
+    parser.add_argument("--unix", help="Unix socket path (localhost TCP if not given)")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--keyframe-interval", type=int, default=KEYFRAME_INTERVAL)
+    args = parser.parse_args()
+
+    h, w = args.size
+    if args.pattern is None:
+        grid = grid_operations.create_random_grid(h, w)
+    else:
+        pattern = pattern_importer.import_rle(args.pattern)
+        if pattern is None:
+            parser.error("There was error during importing file:\n{}".format(args.pattern))
+        grid = grid_operations.create_empty_grid(h, w)
+        if not grid_operations.insert_pattern_into_grid(pattern, grid, ((w - pattern.shape[1]) // 2,
+                                                                        (h - pattern.shape[0]) // 2)):
+            parser.error("Pattern shape {} is too big for this grid ({}x{})".format(pattern.shape, h, w))
+
+    server = LifeServer(grid, args.gps, args.keyframe_interval)
+    try:
+        asyncio.run(server.serve(args.unix, port=args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
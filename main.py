@@ -3,6 +3,9 @@ from pygame import Color
 import os
 import life.grid_operations as grid_operations
 import life.pattern_importer as pattern_importer
+from life.instrumentation import Instrumentation
+from life.growing_grid import GrowingGrid
+from pattern_browser import PatternBrowser
 
 import easygui
 
@@ -22,6 +25,11 @@ GPS_MIN = 1
 GPS_MAX = 20
 FONT_SIZE = 18
 FONT_LINE_SPACING = 1.15
+METRICS_FILE = "metrics"  # exported as metrics.csv and metrics.json
+PROFILE = False  # run update_grid, GrowingGrid.step and draw_grid under cProfile
+TRACK_ALLOCATIONS = False  # record memory allocated in every generation (slow)
+GROWING = False  # start in growing grid mode (window shows W x H part of unbounded plane)
+PATTERNS_DIRECTORY = os.path.join("patterns", "RLE")
 
 GAME_INFO_PLAY = """THE GAME OF LIFE
 
@@ -30,6 +38,8 @@ C - CLEAR GRID
 R - RANDOM GRID
 L - GRID LINES
 D - DEBUG
+G - GROWING GRID
+M - EXPORT METRICS
 ESC / Q - QUIT
 ARROW UP - FASTER
 ARROW DOWN - SLOWER"""
@@ -39,8 +49,11 @@ P - PLAY / PAUSE
 C - CLEAR GRID
 R - RANDOM GRID
 I - IMPORT PATTERN
+O - OPEN PATTERN FILE
 L - GRID LINES
 D - DEBUG
+G - GROWING GRID
+M - EXPORT METRICS
 ESC / Q - QUIT
 ARROW UP - FASTER
 ARROW DOWN - SLOWER
@@ -65,6 +78,7 @@ def draw_pattern(surf, pattern, position, cell_size):
     """Draw pattern preview on surface"""
     x_grid, y_grid = grid_operations.mouse_to_grid_position(position, cell_size)
     h, w = pattern.shape
+    surf.set_clip((0, 0, W * cell_size, H * cell_size))  # pattern may be bigger than grid in growing mode
     for i in range(h):
         for j in range(w):
             if pattern[i, j] == 1:
@@ -75,6 +89,7 @@ def draw_pattern(surf, pattern, position, cell_size):
     pygame.draw.rect(surf, pygame.Color(PATTERN_BOX_COLOR),
                      (x_grid * cell_size, y_grid * cell_size,
                       w * cell_size, h * cell_size), 1)
+    surf.set_clip(None)
 
 
 def draw_grid_lines(surf, cell_size):
@@ -134,14 +149,18 @@ def draw_cell_at_cursor(surf, position, cell_size):
                       cell_size, cell_size))
 
 
-def add_cell(grid, position, cell_size):
+def add_cell(grid, position, cell_size, world=None):
     x_grid, y_grid = grid_operations.mouse_to_grid_position(position, cell_size)
     grid[y_grid, x_grid] = 1  # y, x order
+    if world is not None:  # growing grid mode
+        world.set_cell(y_grid, x_grid, 1)
 
 
-def erase_cell(grid, position, cell_size):
+def erase_cell(grid, position, cell_size, world=None):
     x_grid, y_grid = grid_operations.mouse_to_grid_position(position, cell_size)
     grid[y_grid, x_grid] = 0
+    if world is not None:  # growing grid mode
+        world.set_cell(y_grid, x_grid, 0)
 
 
 def is_point_on_grid(position, cell_size):
@@ -152,17 +171,30 @@ def is_point_on_grid(position, cell_size):
         return False
 
 
-def is_pattern_on_grid(grid, pattern, position, cell_size):
+def is_pattern_on_grid(grid, pattern, position, cell_size, growing=False):
     x, y = position
     h, w = pattern.shape
     x2, y2 = x + (w - 1) * cell_size, y + (h - 1) * cell_size
-    # check two nodes of bbox
-    if is_point_on_grid(position, cell_size) and is_point_on_grid((x2, y2), cell_size):
+    # check two nodes of bbox (in growing mode pattern may exceed grid)
+    if is_point_on_grid(position, cell_size) and (growing or is_point_on_grid((x2, y2), cell_size)):
         return True
     else:
         return False
 
 
+def load_pattern(pattern_file, growing):
+    """Import pattern from file, show message and return None if it can't be inserted into grid"""
+    pattern = pattern_importer.import_rle(pattern_file)
+    if pattern is None:
+        easygui.msgbox("There was error during importing file:\n{}".format(pattern_file), "Error!")
+        return None
+    h, w = pattern.shape
+    if 0 < h <= H and 0 < w <= W or growing and 0 < h and 0 < w:
+        return pattern
+    easygui.msgbox("Pattern shape ({}x{}) is too big for this grid ({}x{})".format(h, w, H, W), "Warning!")
+    return None
+
+
 def main():
     # PyGame initialization
     os.environ['SDL_VIDEO_CENTERED'] = '1'  # centers window, must be before pygame.init()!
@@ -183,131 +215,187 @@ def main():
     cell_size = int(size / (H if H > W else W))
 
     grid_now = grid_operations.create_empty_grid(W, H)
+    world = GrowingGrid(H, W)  # unbounded plane used in growing grid mode
+
+    # instrumentation
+    instrumentation = Instrumentation(track_allocations=TRACK_ALLOCATIONS)
+    update_grid = grid_operations.update_grid
+    step_world = GrowingGrid.step  # unbound, so it works for every replaced 'world'
+    draw = draw_grid
+    if PROFILE:
+        update_grid = instrumentation.profile(update_grid)
+        step_world = instrumentation.profile(step_world)
+        draw = instrumentation.profile(draw)
 
     # game loop variables
     running = True
     play = False
     debug = False
     show_grid_lines = True if GRID_CELLS <= 100 else False
+    growing = GROWING
     pattern_imported = False
+    browser = None
+    browsing = False
     iteration = 1
     position = (0, 0)
     while running:
         # keep loop running at the right speed
         clock.tick(gps)
         iteration += 1
-        pygame.display.set_caption("The Game Of Life [iteration: {} fps: {:.1f}]".format(iteration, clock.get_fps()))
+        caption = "The Game Of Life [iteration: {} fps: {:.1f}".format(iteration, clock.get_fps())
+        if growing:
+            caption += " grid: {}x{}".format(*world.shape)
+        record = instrumentation.last()
+        if record is not None:
+            caption += " step: {:.1f} ms render: {:.1f} ms events: {:.1f} ms".format(
+                1000 * record["step"], 1000 * record["render"], 1000 * record["events"])
+        pygame.display.set_caption(caption + "]")
+        instrumentation.start_generation()
 
         # PROCESS INPUT (EVENTS)
-        for event in pygame.event.get():
-            # check for closing window
-            if event.type == pygame.QUIT:
-                running = False
-
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_p:
-                    play = not play
-                    pattern_imported = False
-                elif event.key == pygame.K_l:
-                    show_grid_lines = not show_grid_lines
-                elif event.key == pygame.K_c:
-                    grid_operations.clear_grid(grid_now)
-                elif event.key == pygame.K_r:
-                    grid_now = grid_operations.create_random_grid(W, H)
-                elif event.key == pygame.K_d:
-                    debug = not debug
-                elif event.key == pygame.K_i and not play:
-                    pattern_file = easygui.fileopenbox(
-                        msg="Chose pattern file",
-                        title="Open file",
-                        default="*.rle")
+        with instrumentation.measure("events"):
+            for event in pygame.event.get():
+                # pattern browser takes all input until pattern is chosen or browser is closed
+                if browsing and event.type != pygame.QUIT:
+                    pattern_file = browser.handle_event(event)
                     if pattern_file is not None:
-                        pattern = pattern_importer.import_rle(pattern_file)
-                        if pattern is not None:
-                            h, w = pattern.shape
-                            if 0 < h <= H and 0 < w <= W:
-                                pattern_imported = True
-                            else:
-                                easygui.msgbox(
-                                    "Pattern shape ({}x{}) is too big for this grid ({}x{})".format(h, w, H, W),
-                                    "Warning!")
-                        else:
-                            easygui.msgbox("There was error during importing file:\n{}".format(pattern_file), "Error!")
-                elif event.key == pygame.K_DOWN:
-                    gps = gps - 1 if gps > GPS_MIN else GPS_MIN
-                elif event.key == pygame.K_UP:
-                    gps = gps + 1 if gps < GPS_MAX else GPS_MAX
-                elif event.key in (pygame.K_q, pygame.K_ESCAPE):
+                        browsing = False
+                        if pattern_file:
+                            pattern = load_pattern(pattern_file, growing)
+                            pattern_imported = pattern is not None
+                    continue
+
+                # check for closing window
+                if event.type == pygame.QUIT:
                     running = False
 
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if not play:
-                    if (pattern_imported and
-                            is_pattern_on_grid(grid_now, pattern, event.pos, cell_size)):
-                        if event.button == 1:  # LEFT=1
-                            if not grid_operations.insert_pattern_into_grid(pattern, grid_now,
-                                                                            grid_operations.mouse_to_grid_position(
-                                                                                event.pos, cell_size)):
-                                h, w = pattern.shape
-                                easygui.msgbox(
-                                    "Pattern shape ({}x{}) is too big for this grid ({}x{})".format(h, w, H, W),
-                                    "Warning!")
-                        elif event.button == 3:  # RIGHT=3
-                            pattern_imported = False
-
-                    elif is_point_on_grid(event.pos, cell_size):
-                        if event.button == 1:  # LEFT=1
-                            add_cell(grid_now, event.pos, cell_size)
-                        elif event.button == 3:  # RIGHT=3
-                            erase_cell(grid_now, event.pos, cell_size)
-
-            elif event.type == pygame.MOUSEMOTION:  # Detected mouse motion
-                position = event.pos  # set mouse positions to the new position
-                if not play:
-                    if is_point_on_grid(event.pos, cell_size):
-                        if pygame.mouse.get_pressed()[0] == 1:
-                            add_cell(grid_now, event.pos, cell_size)
-                        elif pygame.mouse.get_pressed()[2] == 1:
-                            erase_cell(grid_now, event.pos, cell_size)
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_p:
+                        play = not play
+                        pattern_imported = False
+                    elif event.key == pygame.K_l:
+                        show_grid_lines = not show_grid_lines
+                    elif event.key == pygame.K_c:
+                        grid_operations.clear_grid(grid_now)
+                        world.clear()
+                    elif event.key == pygame.K_r:
+                        grid_now = grid_operations.create_random_grid(W, H)
+                        world = GrowingGrid(H, W, grid_now)
+                    elif event.key == pygame.K_g:
+                        growing = not growing
+                        world = GrowingGrid(H, W, grid_now)
+                    elif event.key == pygame.K_d:
+                        debug = not debug
+                    elif event.key == pygame.K_m:
+                        instrumentation.export_csv(METRICS_FILE + ".csv")
+                        instrumentation.export_json(METRICS_FILE + ".json")
+                    elif event.key == pygame.K_i and not play:
+                        if browser is None:
+                            browser = PatternBrowser(PATTERNS_DIRECTORY, font, (0, 0, size, size))
+                        browsing = True
+                    elif event.key == pygame.K_o and not play:
+                        pattern_file = easygui.fileopenbox(
+                            msg="Chose pattern file",
+                            title="Open file",
+                            default="*.rle")
+                        if pattern_file is not None:
+                            pattern = load_pattern(pattern_file, growing)
+                            pattern_imported = pattern is not None
+                    elif event.key == pygame.K_DOWN:
+                        gps = gps - 1 if gps > GPS_MIN else GPS_MIN
+                    elif event.key == pygame.K_UP:
+                        gps = gps + 1 if gps < GPS_MAX else GPS_MAX
+                    elif event.key in (pygame.K_q, pygame.K_ESCAPE):
+                        running = False
+
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if not play:
+                        if (pattern_imported and
+                                is_pattern_on_grid(grid_now, pattern, event.pos, cell_size, growing)):
+                            if event.button == 1 and growing:
+                                x_grid, y_grid = grid_operations.mouse_to_grid_position(event.pos, cell_size)
+                                world.insert_pattern(pattern, y_grid, x_grid)
+                                grid_now = world.viewport(0, 0, H, W)
+                            elif event.button == 1:  # LEFT=1
+                                if not grid_operations.insert_pattern_into_grid(pattern, grid_now,
+                                                                                grid_operations.mouse_to_grid_position(
+                                                                                    event.pos, cell_size)):
+                                    h, w = pattern.shape
+                                    easygui.msgbox(
+                                        "Pattern shape ({}x{}) is too big for this grid ({}x{})".format(h, w, H, W),
+                                        "Warning!")
+                            elif event.button == 3:  # RIGHT=3
+                                pattern_imported = False
+
+                        elif is_point_on_grid(event.pos, cell_size):
+                            if event.button == 1:  # LEFT=1
+                                add_cell(grid_now, event.pos, cell_size, world if growing else None)
+                            elif event.button == 3:  # RIGHT=3
+                                erase_cell(grid_now, event.pos, cell_size, world if growing else None)
+
+                elif event.type == pygame.MOUSEMOTION:  # Detected mouse motion
+                    position = event.pos  # set mouse positions to the new position
+                    if not play:
+                        if is_point_on_grid(event.pos, cell_size):
+                            if pygame.mouse.get_pressed()[0] == 1:
+                                add_cell(grid_now, event.pos, cell_size, world if growing else None)
+                            elif pygame.mouse.get_pressed()[2] == 1:
+                                erase_cell(grid_now, event.pos, cell_size, world if growing else None)
 
         # UPDATE
         if play:
-            grid_now = grid_operations.update_grid(grid_now, H, W)
+            with instrumentation.measure("step"):
+                if growing:
+                    step_world(world)
+                    grid_now = world.viewport(0, 0, H, W)
+                else:
+                    grid_now = update_grid(grid_now, H, W)
 
         # DRAW / RENDER
-        surface.fill(Color('white'))
-        draw_game_info_area(surface, size)
-        display_game_info(surface, font, size, play)
-        if debug:
-            debug_info = {
-                "FPS": gps,
-                "RUNNING": running,
-                "PLAY": play,
-                "DEBUG": debug,
-                "SHOW_GRID_LINES": show_grid_lines,
-                "PATTERN_IMPORTED": pattern_imported,
-                "GRID_SIZE": (H, W),
-                "CELL_SIZE": cell_size,
-                "SIZE": size,
-                "POSITION": position}
-
-            display_debug(surface, font, debug_info, size)
-
-        draw_grid(surface, grid_now, cell_size)
-
-        if show_grid_lines:
-            draw_grid_lines(surface, cell_size)
-
-        # pause mode
-        if not play:
-            if pattern_imported and is_pattern_on_grid(grid_now, pattern, position, cell_size):
-                draw_pattern(surface, pattern, position, cell_size)
-            elif is_point_on_grid(position, cell_size):
-                draw_cell_at_cursor(surface, position, cell_size)
-
-        # *after* drawing everything, flip the display
-        pygame.display.flip()
+        with instrumentation.measure("render"):
+            surface.fill(Color('white'))
+            draw_game_info_area(surface, size)
+            display_game_info(surface, font, size, play)
+            if debug:
+                debug_info = {
+                    "FPS": gps,
+                    "RUNNING": running,
+                    "PLAY": play,
+                    "DEBUG": debug,
+                    "SHOW_GRID_LINES": show_grid_lines,
+                    "PATTERN_IMPORTED": pattern_imported,
+                    "GRID_SIZE": (H, W),
+                    "CELL_SIZE": cell_size,
+                    "SIZE": size,
+                    "POSITION": position}
+
+                display_debug(surface, font, debug_info, size)
+
+            draw(surface, grid_now, cell_size)
+
+            if show_grid_lines:
+                draw_grid_lines(surface, cell_size)
+
+            # pause mode
+            if not play:
+                if pattern_imported and is_pattern_on_grid(grid_now, pattern, position, cell_size, growing):
+                    draw_pattern(surface, pattern, position, cell_size)
+                elif is_point_on_grid(position, cell_size):
+                    draw_cell_at_cursor(surface, position, cell_size)
+
+            if browsing:
+                browser.draw(surface)
+
+            # *after* drawing everything, flip the display
+            pygame.display.flip()
+
+        # paused frames are not generations, their timings are discarded by next 'start_generation'
+        if play:
+            population = world.population() if growing else grid_operations.count_population(grid_now)
+            instrumentation.end_generation(population)
 
+    if PROFILE:
+        instrumentation.print_stats()
     pygame.quit()
 
 
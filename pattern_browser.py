@@ -0,0 +1,194 @@
+import queue
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+from pygame import Color
+
+import life.pattern_index as pattern_index
+
+BACKGROUND_COLOR = "#ffffff"
+FONT_COLOR = "#17202a"
+CELL_COLOR = "#17202a"
+TILE_COLOR = "#ccd1d1"
+SELECTED_COLOR = "#3498db"
+THUMBNAIL_SIZE = 128
+TILE_MARGIN = 12
+THUMBNAIL_CACHE_SIZE = 256  # rendered thumbnails kept in memory
+
+
+class PatternBrowser:
+    """
+        Pattern library browser with search field and thumbnails.
+
+        Only thumbnails of visible patterns are requested. They are parsed and rendered
+        by a background thread and kept as surfaces in a LRU cache.
+
+        Parameters
+        ----------
+        directory : str
+            directory with RLE-files
+        font : pygame.font.Font
+            font for search field and pattern names
+        rect : tuple(int, int, int, int)
+            browser area (x, y, width, height) on surface
+    """
+
+    def __init__(self, directory, font, rect):
+        self.index = pattern_index.build_index(directory)
+        self.font = font
+        self.rect = pygame.Rect(rect)
+        self.query = ""
+        self.entries = self.index
+        self.selected = 0
+        self.scroll = 0  # first visible row
+
+        self.thumbnails = OrderedDict()  # path -> surface (None if there is no thumbnail)
+        self.pending = set()
+        self.visible = set()
+        self.requests = queue.Queue()
+        self.rendered = queue.Queue()
+        threading.Thread(target=self.render_thumbnails, daemon=True).start()
+
+    @property
+    def columns(self):
+        return max(1, self.rect.width // (THUMBNAIL_SIZE + TILE_MARGIN))
+
+    @property
+    def rows(self):
+        tile_height = THUMBNAIL_SIZE + TILE_MARGIN + 2 * self.font.get_linesize()
+        return max(1, (self.rect.height - 2 * self.font.get_linesize()) // tile_height)
+
+    def render_thumbnails(self):
+        """Background thread rendering requested thumbnails which are still visible"""
+        while True:
+            entry = self.requests.get()
+            if entry["path"] in self.visible:
+                self.rendered.put((entry["path"], True, pattern_index.load_thumbnail(entry, THUMBNAIL_SIZE)))
+            else:  # scrolled away before rendering
+                self.rendered.put((entry["path"], False, None))
+
+    def set_query(self, query):
+        self.query = query
+        self.entries = pattern_index.search(self.index, query)
+        self.selected = 0
+        self.scroll = 0
+
+    def move(self, offset):
+        """Move selection and scroll list to keep it visible"""
+        if not self.entries:
+            return
+        self.selected = min(max(self.selected + offset, 0), len(self.entries) - 1)
+        row = self.selected // self.columns
+        if row < self.scroll:
+            self.scroll = row
+        elif row >= self.scroll + self.rows:
+            self.scroll = row - self.rows + 1
+
+    def handle_event(self, event):
+        """
+            Process event
+
+            Parameters
+            ----------
+            event : pygame.event.Event
+                event from queue
+
+            Returns
+            -------
+            result : str or None
+                chosen pattern file path, empty string if browser was closed, None otherwise
+        """
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return ""
+            elif event.key == pygame.K_RETURN:
+                return self.entries[self.selected]["path"] if self.entries else None
+            elif event.key == pygame.K_BACKSPACE:
+                self.set_query(self.query[:-1])
+            elif event.key == pygame.K_LEFT:
+                self.move(-1)
+            elif event.key == pygame.K_RIGHT:
+                self.move(1)
+            elif event.key == pygame.K_UP:
+                self.move(-self.columns)
+            elif event.key == pygame.K_DOWN:
+                self.move(self.columns)
+            elif event.key == pygame.K_PAGEUP:
+                self.move(-self.columns * self.rows)
+            elif event.key == pygame.K_PAGEDOWN:
+                self.move(self.columns * self.rows)
+            elif event.unicode and event.unicode.isprintable():
+                self.set_query(self.query + event.unicode)
+        elif event.type == pygame.MOUSEWHEEL:
+            self.move(-event.y * self.columns)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            index = self.tile_at(event.pos)
+            if index is not None:
+                self.selected = index
+                return self.entries[index]["path"]
+        return None
+
+    def tile_rect(self, index):
+        """Return rectangle of tile with given entry index"""
+        row, column = divmod(index, self.columns)
+        tile_height = THUMBNAIL_SIZE + TILE_MARGIN + 2 * self.font.get_linesize()
+        return pygame.Rect(self.rect.x + column * (THUMBNAIL_SIZE + TILE_MARGIN),
+                           self.rect.y + 2 * self.font.get_linesize() + (row - self.scroll) * tile_height,
+                           THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+
+    def visible_range(self):
+        first = self.scroll * self.columns
+        return range(first, min(first + self.rows * self.columns, len(self.entries)))
+
+    def tile_at(self, position):
+        for index in self.visible_range():
+            if self.tile_rect(index).collidepoint(position):
+                return index
+        return None
+
+    def collect_thumbnails(self):
+        """Move thumbnails rendered by background thread to LRU cache as surfaces"""
+        while not self.rendered.empty():
+            path, done, thumbnail = self.rendered.get()
+            self.pending.discard(path)
+            if not done:  # requested again when visible
+                continue
+            if thumbnail is None:  # too big or invalid pattern
+                surface = None
+            else:
+                pixels = np.where(thumbnail.T[:, :, np.newaxis] == 1,
+                                  Color(CELL_COLOR)[:3], Color(BACKGROUND_COLOR)[:3]).astype(np.uint8)
+                surface = pygame.surfarray.make_surface(pixels)
+            self.thumbnails[path] = surface
+            if len(self.thumbnails) > THUMBNAIL_CACHE_SIZE:
+                self.thumbnails.popitem(last=False)
+
+    def draw(self, surf):
+        """Draw search field and visible tiles on surface"""
+        self.collect_thumbnails()
+        surf.fill(Color(BACKGROUND_COLOR), self.rect)
+        surf.blit(self.font.render("SEARCH: {}_   ({} / {} patterns, HxW - max size, ENTER - choose, ESC - cancel)"
+                                   .format(self.query, len(self.entries), len(self.index)), 1, Color(FONT_COLOR)),
+                  (self.rect.x, self.rect.y))
+
+        self.visible = {self.entries[index]["path"] for index in self.visible_range()}
+        for index in self.visible_range():
+            entry = self.entries[index]
+            rect = self.tile_rect(index)
+            path = entry["path"]
+            if path in self.thumbnails:
+                self.thumbnails.move_to_end(path)
+                thumbnail = self.thumbnails[path]
+                if thumbnail is not None:
+                    surf.blit(thumbnail, thumbnail.get_rect(center=rect.center))
+            elif path not in self.pending:
+                self.pending.add(path)
+                self.requests.put(entry)
+            color = SELECTED_COLOR if index == self.selected else TILE_COLOR
+            pygame.draw.rect(surf, Color(color), rect, 2 if index == self.selected else 1)
+            name = entry["name"][:(THUMBNAIL_SIZE + TILE_MARGIN) // self.font.size("m")[0]]
+            for i, line in enumerate((name, "{}x{}".format(entry["height"], entry["width"]))):
+                surf.blit(self.font.render(line, 1, Color(FONT_COLOR)),
+                          (rect.x, rect.bottom + i * self.font.get_linesize()))
@@ -0,0 +1,92 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import life.analyzer as analyzer
+
+PATTERNS_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "patterns", "RLE")
+
+
+class TestAnalyzer(unittest.TestCase):
+    def setUp(self):
+        os.environ['NUMBA_DISABLE_JIT'] = '1'
+
+    def test_crop(self):
+        grid = np.zeros((5, 6), dtype=np.int32)
+        grid[1, 2] = grid[3, 4] = 1
+        cropped, offset = analyzer.crop(grid)
+        self.assertEqual(cropped.shape, (3, 3))
+        self.assertEqual(offset, (1, 2))
+
+    def test_format_speed(self):
+        self.assertEqual(analyzer.format_speed(1, 1, 4), "c/4")
+        self.assertEqual(analyzer.format_speed(0, -2, 4), "c/2")
+        self.assertEqual(analyzer.format_speed(2, 0, 5), "2c/5")
+        self.assertEqual(analyzer.format_speed(0, 0, 2), "0")
+
+    def test_characterize_still_life(self):
+        block = np.ones((2, 2), dtype=np.int32)
+        result = analyzer.characterize(block)
+        self.assertEqual((result["fate"], result["period"], result["stabilized_at"]), ("stabilizes", 1, 0))
+
+    def test_characterize_oscillator(self):
+        blinker = np.ones((1, 3), dtype=np.int32)
+        result = analyzer.characterize(blinker)
+        self.assertEqual((result["fate"], result["period"], result["speed"]), ("stabilizes", 2, "0"))
+        self.assertEqual(result["bbox_initial"], [1, 3])
+
+    def test_characterize_spaceship(self):
+        glider = np.array([[0, 1, 0],
+                           [0, 0, 1],
+                           [1, 1, 1]])
+        result = analyzer.characterize(glider)
+        self.assertEqual((result["fate"], result["period"], result["dx"], result["dy"], result["speed"]),
+                         ("spaceship", 4, 1, 1, "c/4"))
+        self.assertEqual((result["population_min"], result["population_max"]), (5, 5))
+
+    def test_characterize_dies(self):
+        diagonal = np.eye(2, dtype=np.int32)
+        result = analyzer.characterize(diagonal)
+        self.assertEqual((result["fate"], result["population_min"]), ("dies", 0))
+
+    def test_characterize_grows(self):
+        gun = analyzer.analyze_file(os.path.join(PATTERNS_DIRECTORY, "gosperglidergun.rle"), 200)
+        self.assertEqual(gun["fate"], "grows")
+
+    def test_analyze_file_oscillator(self):
+        # pulsar RLE-file skips rows with 'N$'
+        pulsar = analyzer.analyze_file(os.path.join(PATTERNS_DIRECTORY, "pulsar.rle"), 20)
+        self.assertEqual((pulsar["fate"], pulsar["period"], pulsar["population_max"]), ("stabilizes", 3, 72))
+
+    def test_analyze_file_spaceship(self):
+        copperhead = analyzer.analyze_file(os.path.join(PATTERNS_DIRECTORY, "copperhead.rle"), 30)
+        self.assertEqual((copperhead["fate"], copperhead["period"], copperhead["speed"]), ("spaceship", 10, "c/10"))
+
+    def test_analyze_library_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("glider.rle", "blinker.rle"):
+                shutil.copy(os.path.join(PATTERNS_DIRECTORY, name), directory)
+            results = analyzer.analyze_library(directory, 10, workers=0)
+            self.assertEqual([(result["name"], result["fate"]) for result in results],
+                             [("blinker.rle", "stabilizes"), ("glider.rle", "spaceship")])
+
+            # cached results are not computed again
+            cache_file = os.path.join(directory, analyzer.CACHE_FILE)
+            with open(cache_file) as file:
+                cache = json.load(file)
+            for result in cache.values():
+                result["fate"] = "cached"
+            with open(cache_file, "w") as file:
+                json.dump(cache, file)
+            results = analyzer.analyze_library(directory, 10, workers=0)
+            self.assertEqual([result["fate"] for result in results], ["cached", "cached"])
+
+            # results for different number of generations are computed again
+            results = analyzer.analyze_library(directory, 12, workers=0)
+            self.assertEqual([result["fate"] for result in results], ["stabilizes", "spaceship"])
+
+
+if __name__ == '__main__':
+    unittest.main()
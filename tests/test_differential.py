@@ -0,0 +1,152 @@
+"""
+    Differential tests of optimized stepping paths against reference 'update_grid'.
+
+    Random soups and patterns from patterns/RLE are advanced K generations by the reference and by every engine:
+    - bounded mode (cells outside grid are dead): 'step' with default and small tiles,
+    - unbounded mode (infinite plane): 'GrowingGrid' compared with reference on grid padded by K + 1 cells.
+
+    Performance gate measures throughput (cell generations per second) of every engine and fails
+    if it is below MIN_SPEEDUP times reference throughput (skipped when Numba JIT is disabled).
+    Whether JIT is disabled is checked when tests run, as other test modules may change it after import.
+
+    Environment variables:
+    LIFE_DIFFERENTIAL_GENERATIONS - number of generations K (default: 8 with JIT, 4 without JIT)
+    LIFE_DIFFERENTIAL_MAX_CELLS - bigger patterns are skipped (default: 250000 with JIT, 2500 without JIT)
+    LIFE_DIFFERENTIAL_FILES - 'all' or number of evenly sampled files (default: all with JIT, 20 without JIT)
+    LIFE_MIN_SPEEDUP - required speedups, e.g. 'step=1.5,growing_grid=1.0'
+    LIFE_BENCHMARK_FILE - JSON-file for measured throughputs
+"""
+import unittest
+import glob
+import json
+import os
+import time
+import numpy as np
+import numba
+import life.grid_operations as grid_operations
+import life.pattern_importer as pattern_importer
+from life.growing_grid import GrowingGrid
+
+PATTERNS_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "patterns", "RLE")
+MIN_SPEEDUP = {"step": 1.5, "growing_grid": 1.0}
+MIN_SPEEDUP.update((name, float(value)) for name, value in
+                   (item.split("=") for item in os.environ.get("LIFE_MIN_SPEEDUP", "").split(",") if item))
+BENCHMARK_SIZE = 512
+BENCHMARK_GENERATIONS = 16
+
+
+def reference(grid, n):
+    h, w = grid.shape
+    for i in range(n):
+        grid = grid_operations.update_grid(grid, h, w)
+    return grid
+
+
+def reference_unbounded(grid, n):
+    return reference(np.pad(grid, n + 1), n)
+
+
+def growing_grid(grid, n):
+    h, w = grid.shape
+    plane = GrowingGrid(h, w, grid)
+    plane.step(n)
+    return plane.viewport(-n - 1, -n - 1, h + 2 * n + 2, w + 2 * n + 2)
+
+
+def growing_grid_single(grid, n):
+    h, w = grid.shape
+    plane = GrowingGrid(h, w, grid)
+    for i in range(n):
+        plane.step()
+    return plane.viewport(-n - 1, -n - 1, h + 2 * n + 2, w + 2 * n + 2)
+
+
+BOUNDED_ENGINES = {
+    "step": grid_operations.step,
+    "step_small_tiles": lambda grid, n: grid_operations.step(grid, n, 16, 3),
+}
+UNBOUNDED_ENGINES = {
+    "growing_grid": growing_grid,
+    "growing_grid_single": growing_grid_single,
+}
+
+
+def pattern_files(sample):
+    files = sorted(glob.glob(os.path.join(PATTERNS_DIRECTORY, "*.rle")))
+    if sample != "all" and int(sample) < len(files):
+        files = [files[i * len(files) // int(sample)] for i in range(int(sample))]
+    return files
+
+
+def throughput(engine, grid, n):
+    engine(grid[:32, :32].copy(), 2)  # compilation
+    best = float("inf")
+    for i in range(3):
+        start = time.perf_counter()
+        engine(grid, n)
+        best = min(best, time.perf_counter() - start)
+    return grid.size * n / best
+
+
+class TestDifferential(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.jit = not numba.config.DISABLE_JIT
+        cls.generations = int(os.environ.get("LIFE_DIFFERENTIAL_GENERATIONS", 8 if cls.jit else 4))
+        cls.max_cells = int(os.environ.get("LIFE_DIFFERENTIAL_MAX_CELLS", 250000 if cls.jit else 2500))
+        cls.files = os.environ.get("LIFE_DIFFERENTIAL_FILES", "all" if cls.jit else "20")
+
+    def assert_engines_match(self, grid, n):
+        expected = reference(grid, n)
+        for name, engine in BOUNDED_ENGINES.items():
+            with self.subTest(engine=name, mode="bounded"):
+                self.assertTrue(np.array_equal(engine(grid, n), expected))
+        expected = reference_unbounded(grid, n)
+        for name, engine in UNBOUNDED_ENGINES.items():
+            with self.subTest(engine=name, mode="unbounded"):
+                self.assertTrue(np.array_equal(engine(grid, n), expected))
+
+    def test_random_soups(self):
+        rng = np.random.default_rng(2022)
+        for h, w in ((1, 1), (3, 40), (17, 17), (40, 3), (70, 130)):
+            for density in (0.1, 0.35, 0.6):
+                with self.subTest(shape=(h, w), density=density):
+                    grid = (rng.random((h, w)) < density).astype(np.int32)
+                    self.assert_engines_match(grid, self.generations)
+
+    def test_pattern_library(self):
+        for pattern_file in pattern_files(self.files):
+            header = pattern_importer.read_rle_header(pattern_file)
+            if header is None or header[0] * header[1] > self.max_cells:
+                continue
+            pattern = pattern_importer.import_rle(pattern_file)
+            if pattern is None or pattern.size == 0:
+                continue
+            with self.subTest(pattern=os.path.basename(pattern_file)):
+                self.assert_engines_match(pattern, self.generations)
+
+    def test_performance_gate(self):
+        if not self.jit:
+            self.skipTest("performance gate requires Numba JIT")
+        rng = np.random.default_rng(2022)
+        grid = (rng.random((BENCHMARK_SIZE, BENCHMARK_SIZE)) < 0.3).astype(np.int32)
+        results = {"reference": throughput(reference, grid, BENCHMARK_GENERATIONS),
+                   "reference_unbounded": throughput(reference_unbounded, grid, BENCHMARK_GENERATIONS)}
+        for name, engine in BOUNDED_ENGINES.items():
+            results[name] = throughput(engine, grid, BENCHMARK_GENERATIONS)
+        for name, engine in UNBOUNDED_ENGINES.items():
+            results[name] = throughput(engine, grid, BENCHMARK_GENERATIONS)
+
+        if "LIFE_BENCHMARK_FILE" in os.environ:
+            with open(os.environ["LIFE_BENCHMARK_FILE"], "w") as file:
+                json.dump(results, file, indent=1)
+
+        for name, min_speedup in MIN_SPEEDUP.items():
+            baseline = results["reference" if name in BOUNDED_ENGINES else "reference_unbounded"]
+            with self.subTest(engine=name):
+                self.assertGreaterEqual(results[name] / baseline, min_speedup,
+                                        "{} throughput {:.3g} cells/s".format(name, results[name]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import os
+import struct
+import tempfile
+import zlib
+import numpy as np
+import life.exporter as exporter
+import life.grid_operations as grid_operations
+
+
+class TestExporter(unittest.TestCase):
+    def setUp(self):
+        os.environ['NUMBA_DISABLE_JIT'] = '1'
+        self.blinker = np.zeros((5, 5), dtype=np.int32)
+        self.blinker[1:4, 2] = 1
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_rasterize(self):
+        frame = exporter.rasterize(np.array([[0, 1], [1, 0]]), 2)
+        out_frame = np.array([[0, 0, 1, 1],
+                              [0, 0, 1, 1],
+                              [1, 1, 0, 0],
+                              [1, 1, 0, 0]])
+        self.assertEqual(frame.dtype, np.uint8)
+        self.assertTrue(np.all(np.equal(frame, out_frame)))
+
+    def test_export_run_gif(self):
+        path = os.path.join(self.directory.name, "blinker.gif")
+        frames = exporter.export_run(self.blinker, path, 4, "gif", cell_size=2, workers=0)
+        with open(path, "rb") as file:
+            data = file.read()
+        self.assertEqual(frames, 5)
+        self.assertTrue(data.startswith(b"GIF89a" + struct.pack("<2H", 10, 10)))
+        self.assertTrue(data.endswith(b";"))
+        self.assertEqual(data.count(b"!\xf9\x04"), frames)
+
+    def test_export_run_apng(self):
+        path = os.path.join(self.directory.name, "blinker.png")
+        exporter.export_run(self.blinker, path, 2, "apng", cell_size=1, workers=0)
+        with open(path, "rb") as file:
+            data = file.read()
+        chunks = []
+        position = 8
+        while position < len(data):
+            length, = struct.unpack(">I", data[position:position + 4])
+            chunks.append((data[position + 4:position + 8], data[position + 8:position + 8 + length]))
+            position += length + 12
+        chunk_types = [chunk_type for chunk_type, chunk_data in chunks]
+        self.assertEqual(chunk_types, [b"IHDR", b"acTL", b"PLTE", b"fcTL", b"IDAT", b"fcTL", b"fdAT",
+                                       b"fcTL", b"fdAT", b"IEND"])
+        scanlines = np.frombuffer(zlib.decompress(chunks[4][1]), dtype=np.uint8).reshape(5, 6)
+        self.assertTrue(np.all(np.equal(scanlines[:, 1:], self.blinker)))
+        sequence = [struct.unpack(">I", chunk_data[:4])[0] for chunk_type, chunk_data in chunks
+                    if chunk_type in (b"fcTL", b"fdAT")]
+        self.assertEqual(sequence, list(range(5)))
+
+    def test_export_run_pgm(self):
+        path = os.path.join(self.directory.name, "frames")
+        exporter.export_run(self.blinker, path, 1, "pgm", cell_size=1, workers=0)
+        self.assertEqual(sorted(os.listdir(path)), ["frame_000000.pgm", "frame_000001.pgm"])
+        with open(os.path.join(path, "frame_000001.pgm"), "rb") as file:
+            data = file.read()
+        pixels = np.frombuffer(data[len(b"P5\n5 5\n255\n"):], dtype=np.uint8).reshape(5, 5)
+        next_grid = grid_operations.update_grid(self.blinker, 5, 5)
+        self.assertTrue(np.all(np.equal(pixels == 0, next_grid == 1)))
+
+    def test_export_run_unknown_format(self):
+        with self.assertRaises(ValueError):
+            exporter.export_run(self.blinker, os.path.join(self.directory.name, "blinker.mp4"), 1, "mp4")
+
+
+if __name__ == '__main__':
+    unittest.main()
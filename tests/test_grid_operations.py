@@ -35,6 +35,11 @@ class TestGridOperations(unittest.TestCase):
         test_grid = np.zeros((self.height, self.width), dtype=np.int32)
         self.assertTrue(grid_operations.is_empty(test_grid))
 
+    def test_count_population(self):
+        test_grid = np.zeros((self.height, self.width), dtype=np.int32)
+        test_grid[1, 2:5] = 1
+        self.assertEqual(grid_operations.count_population(test_grid), 3)
+
     def test_count_neighbours_zeros(self):
         test_grid = np.zeros((self.height, self.width), dtype=np.int32)
         neighbours = grid_operations.count_neighbours(test_grid,
@@ -101,6 +106,23 @@ class TestGridOperations(unittest.TestCase):
             next_grid = grid_operations.update_grid(next_grid, glider_1.shape[0], glider_1.shape[1])
         self.assertTrue(np.all(np.equal(glider_5, next_grid)))
 
+    def test_step_spaceships(self):
+        glider_1 = np.zeros((6, 6), dtype=np.int32)
+        glider_1[1:4, 1:4] = [[0, 1, 0],
+                              [0, 0, 1],
+                              [1, 1, 1]]
+        glider_5 = np.zeros((6, 6), dtype=np.int32)
+        glider_5[2:5, 2:5] = glider_1[1:4, 1:4]
+        self.assertTrue(np.all(np.equal(glider_5, grid_operations.step(glider_1, 4))))
+
+    def test_step_equals_update_grid(self):
+        random_grid = grid_operations.create_random_grid(37, 53)
+        generations = 7
+        next_grid = random_grid
+        for i in range(generations):
+            next_grid = grid_operations.update_grid(next_grid, 37, 53)
+        self.assertTrue(np.all(np.equal(next_grid, grid_operations.step(random_grid, generations, 16, 3))))
+
     def mouse_to_grid_position(self):
         x, y = 3, 24
         cell_size = 10
@@ -0,0 +1,93 @@
+import unittest
+import numpy as np
+import life.grid_operations as grid_operations
+from life.growing_grid import GrowingGrid, MARGIN
+import os
+from unittest import mock
+
+
+class TestGrowingGrid(unittest.TestCase):
+    def setUp(self):
+        os.environ['NUMBA_DISABLE_JIT'] = '1'
+        self.glider = np.array([[0, 1, 0],
+                                [0, 0, 1],
+                                [1, 1, 1]], dtype=np.int32)
+
+    def test_insert_pattern_grows(self):
+        grid = GrowingGrid(5, 5)
+        grid.insert_pattern(self.glider, -4, 6)
+        self.assertEqual(grid.bounding_box(), (-4, 6, -1, 9))
+        self.assertGreaterEqual(grid.shape, (10, 10))
+        self.assertTrue(np.all(np.equal(grid.viewport(-4, 6, 3, 3), self.glider)))
+
+    def test_viewport_outside(self):
+        grid = GrowingGrid(5, 5)
+        grid.set_cell(2, 2, 1)
+        viewport = grid.viewport(1, 1, 10, 10)
+        self.assertEqual(viewport.shape, (10, 10))
+        self.assertEqual(viewport[1, 1], 1)
+        self.assertEqual(grid_operations.count_population(viewport), 1)
+
+    def test_step_spaceship_escapes(self):
+        # glider leaves 6x6 grid and keeps moving
+        grid = GrowingGrid(6, 6, np.pad(self.glider, ((1, 2), (1, 2))))
+        grid.step(40)
+        self.assertEqual(grid.generation, 40)
+        self.assertEqual(grid.population(), 5)
+        self.assertEqual(grid.bounding_box(), (11, 11, 14, 14))
+        self.assertTrue(np.all(np.equal(grid.viewport(11, 11, 3, 3), self.glider)))
+
+    def test_step_only_live_extent(self):
+        grid = GrowingGrid(64, 64)
+        grid.insert_pattern(self.glider, 30, 30)
+        with mock.patch.object(grid_operations, "step", wraps=grid_operations.step) as step:
+            grid.step(4)
+        shapes = [call.args[0].shape for call in step.call_args_list]
+        self.assertEqual(shapes, [(3 + 2 * 4, 3 + 2 * 4)])
+        self.assertEqual(grid.bounding_box(), (31, 31, 34, 34))
+
+    def test_step_equals_padded_update_grid(self):
+        random_grid = grid_operations.create_random_grid(12, 9)
+        generations = 15
+        padding = generations + 1
+        padded_grid = np.pad(random_grid, padding)
+        for i in range(generations):
+            padded_grid = grid_operations.update_grid(padded_grid, *padded_grid.shape)
+        grid = GrowingGrid(12, 9, random_grid)
+        for i in range(generations):
+            grid.step()
+        viewport = grid.viewport(-padding, -padding, *padded_grid.shape)
+        self.assertTrue(np.all(np.equal(viewport, padded_grid)))
+
+    def test_step_escaped_spaceship_bounded_shape(self):
+        # glider leaves 20x20 window while only window is read back (as in growing grid mode)
+        grid = GrowingGrid(20, 20)
+        grid.insert_pattern(self.glider, 2, 2)
+        for i in range(400):
+            grid.step()
+            grid.viewport(0, 0, 20, 20)
+            self.assertLessEqual(max(grid.shape), 4 * (3 + 2 * MARGIN))
+        self.assertEqual(grid.bounding_box(), (102, 102, 105, 105))
+
+    def test_set_cell_dead_outside(self):
+        grid = GrowingGrid(4, 4)
+        grid.set_cell(1000, 1000, 0)
+        self.assertEqual((grid.shape, grid.offset), ((4, 4), (0, 0)))
+
+    def test_shrink(self):
+        grid = GrowingGrid(4, 4)
+        grid.insert_pattern(np.ones((2, 2), dtype=np.int32), 200, -300)  # block
+        self.assertGreater(grid.shape[0], 200)
+        grid.step()
+        self.assertEqual(grid.shape, (2 * (2 + 2 * MARGIN), 2 * (2 + 2 * MARGIN)))
+        self.assertEqual(grid.bounding_box(), (200, -300, 202, -298))
+
+    def test_clear(self):
+        grid = GrowingGrid(4, 4)
+        grid.insert_pattern(self.glider, 10, 10)
+        grid.clear()
+        self.assertEqual((grid.shape, grid.offset, grid.population()), ((4, 4), (0, 0), 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import csv
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from life.instrumentation import Instrumentation, FIELDS
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.instrumentation = Instrumentation()
+
+    def run_generations(self, n):
+        for i in range(n):
+            self.instrumentation.start_generation()
+            with self.instrumentation.measure("step"):
+                pass
+            with self.instrumentation.measure("render"):
+                pass
+            self.instrumentation.end_generation(i)
+
+    def test_end_generation_record(self):
+        self.run_generations(3)
+        record = self.instrumentation.last()
+        self.assertEqual(tuple(record.keys()), FIELDS)
+        self.assertEqual(record["generation"], 3)
+        self.assertEqual(record["population"], 2)
+        self.assertGreaterEqual(record["step"], 0)
+        self.assertEqual(record["events"], 0)
+
+    def test_paused_frames_not_recorded(self):
+        self.run_generations(1)
+        for i in range(3):  # paused frames - events and render without step
+            self.instrumentation.start_generation()
+            with self.instrumentation.measure("events"):
+                time.sleep(0.05)
+        self.instrumentation.start_generation()
+        with self.instrumentation.measure("events"):
+            pass
+        with self.instrumentation.measure("step"):
+            pass
+        self.instrumentation.end_generation(0)
+        self.assertEqual([record["generation"] for record in self.instrumentation.records], [1, 2])
+        self.assertLess(self.instrumentation.last()["events"], 0.05)
+
+    def test_hooks(self):
+        records = []
+        self.instrumentation.add_hook(records.append)
+        self.run_generations(2)
+        self.instrumentation.remove_hook(records.append)
+        self.run_generations(1)
+        self.assertEqual([record["generation"] for record in records], [1, 2])
+
+    def test_max_records(self):
+        self.instrumentation = Instrumentation(max_records=2)
+        self.run_generations(5)
+        self.assertEqual([record["generation"] for record in self.instrumentation.records], [4, 5])
+
+    def test_track_allocations(self):
+        self.instrumentation = Instrumentation(track_allocations=True)
+        self.addCleanup(tracemalloc.stop)
+        self.instrumentation.start_generation()
+        buffer = bytearray(1 << 20)
+        record = self.instrumentation.end_generation(0)
+        self.assertGreaterEqual(record["alloc_peak"], len(buffer))
+
+    def test_profile(self):
+        profiled_sum = self.instrumentation.profile(sum)
+        self.assertEqual(profiled_sum([1, 2, 3]), 6)
+        self.assertIsNotNone(self.instrumentation.profiler)
+
+    def test_export(self):
+        self.run_generations(2)
+        with tempfile.TemporaryDirectory() as directory:
+            csv_file = os.path.join(directory, "metrics.csv")
+            json_file = os.path.join(directory, "metrics.json")
+            self.instrumentation.export_csv(csv_file)
+            self.instrumentation.export_json(json_file)
+            with open(csv_file, newline="") as file:
+                rows = list(csv.DictReader(file))
+            with open(json_file) as file:
+                records = json.load(file)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]["generation"], "2")
+        self.assertEqual(records, list(self.instrumentation.records))
+
+
+if __name__ == '__main__':
+    unittest.main()
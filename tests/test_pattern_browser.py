@@ -0,0 +1,82 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+import life.pattern_importer as pattern_importer
+import life.pattern_index as pattern_index
+import pattern_browser
+
+PATTERNS_DIRECTORY = os.path.join(os.path.dirname(__file__), "patterns")
+
+
+class TestPatternBrowser(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        cls.font = pygame.font.Font(None, 16)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        for i in range(12):
+            shutil.copy(os.path.join(PATTERNS_DIRECTORY, "glider.rle"),
+                        os.path.join(self.directory, "glider{:02}.rle".format(i)))
+        self.loaded = []
+
+        def load_thumbnail(entry, size):
+            self.loaded.append(entry["path"])
+            return pattern_index.render_thumbnail(pattern_importer.import_rle(entry["path"]), size)
+
+        patcher = mock.patch.object(pattern_index, "load_thumbnail", load_thumbnail)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.surface = pygame.Surface((400, 400))
+        self.browser = pattern_browser.PatternBrowser(self.directory, self.font, (0, 0, 400, 400))
+
+    def wait_for_thumbnails(self):
+        """Draw browser until all requested thumbnails are rendered"""
+        self.browser.draw(self.surface)
+        deadline = time.monotonic() + 5
+        while self.browser.pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+            self.browser.collect_thumbnails()
+        self.assertEqual(self.browser.pending, set())
+
+    def visible_paths(self):
+        return {self.browser.entries[index]["path"] for index in self.browser.visible_range()}
+
+    def test_only_visible_thumbnails_loaded(self):
+        self.wait_for_thumbnails()
+        visible = self.visible_paths()
+        self.assertLess(len(visible), len(self.browser.entries))
+        self.assertEqual(set(self.loaded), visible)
+        self.assertEqual(set(self.browser.thumbnails), visible)
+
+    def test_scrolled_away_not_loaded(self):
+        entry = self.browser.entries[-1]
+        self.browser.visible = set()
+        self.browser.pending.add(entry["path"])
+        self.browser.requests.put(entry)
+        self.wait_for_thumbnails()
+        self.assertNotIn(entry["path"], self.loaded)
+        self.assertNotIn(entry["path"], self.browser.thumbnails)
+
+    def test_thumbnail_cache_eviction(self):
+        with mock.patch.object(pattern_browser, "THUMBNAIL_CACHE_SIZE", 3):
+            for i in range(len(self.browser.entries)):
+                self.browser.move(1)
+                self.wait_for_thumbnails()
+                self.assertLessEqual(len(self.browser.thumbnails), 3)
+        self.assertEqual(set(self.loaded), {entry["path"] for entry in self.browser.entries})
+        # least recently drawn thumbnails are evicted first
+        self.assertGreaterEqual(len(self.visible_paths()), 3)
+        self.assertLessEqual(set(self.browser.thumbnails), self.visible_paths())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -50,6 +50,15 @@ class TestPatternImporter(unittest.TestCase):
         pattern_fake = pattern_importer.import_rle(r'tests\patterns\fake.rle')
         self.assertIsNone(pattern_fake)
 
+    def test_read_rle_header(self):
+        header = pattern_importer.read_rle_header(os.path.join(os.path.dirname(__file__), "..",
+                                                               "patterns", "RLE", "glider.rle"))
+        self.assertEqual(header, (3, 3, "B3/S23"))
+
+    def test_read_rle_header_none(self):
+        self.assertIsNone(pattern_importer.read_rle_header(os.path.join(os.path.dirname(__file__), "patterns",
+                                                                        "missing.rle")))
+
     def test_parse_rle_digits_digit(self):
         digits = "12"
         self.assertEqual(pattern_importer.parse_rle_digits(digits), 12)
@@ -75,6 +84,12 @@ class TestPatternImporter(unittest.TestCase):
                                    [0, 0, 1, 1, 0, 0, 0]])
         self.assertTrue(np.all(np.equal(pattern_from_line, beacon_pattern)))
 
+    def test_parse_rle_line_skip_rows(self):
+        pattern_from_line = np.zeros((4, 2), dtype=np.int32)
+        index = pattern_importer.parse_rle_line(pattern_from_line, "2o3$bo!", (0, 0), "")
+        self.assertEqual(index, (3, 2))
+        self.assertTrue(np.all(np.equal(pattern_from_line, [[1, 1], [0, 0], [0, 0], [0, 1]])))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import os
+import numpy as np
+import life.pattern_index as pattern_index
+
+PATTERNS_DIRECTORY = os.path.join(os.path.dirname(__file__), "patterns")
+
+
+class TestPatternIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = pattern_index.build_index(PATTERNS_DIRECTORY)
+
+    def test_build_index(self):
+        # fake.rle has no header
+        self.assertEqual([(entry["name"], entry["height"], entry["width"]) for entry in self.index],
+                         [("2fumaroles", 12, 15), ("glider", 3, 3)])
+
+    def test_search_name(self):
+        self.assertEqual([entry["name"] for entry in pattern_index.search(self.index, "GLI")], ["glider"])
+        self.assertEqual(pattern_index.search(self.index, "glider fumaroles"), [])
+
+    def test_search_size(self):
+        self.assertEqual([entry["name"] for entry in pattern_index.search(self.index, "10x10")], ["glider"])
+        self.assertEqual(len(pattern_index.search(self.index, "12x15")), 2)
+
+    def test_render_thumbnail_enlarge(self):
+        thumbnail = pattern_index.render_thumbnail(np.eye(2, dtype=np.int32), 5)
+        self.assertTrue(np.all(np.equal(thumbnail, [[1, 1, 0, 0],
+                                                    [1, 1, 0, 0],
+                                                    [0, 0, 1, 1],
+                                                    [0, 0, 1, 1]])))
+
+    def test_render_thumbnail_reduce(self):
+        pattern = np.zeros((5, 3), dtype=np.int32)
+        pattern[4, 2] = 1
+        thumbnail = pattern_index.render_thumbnail(pattern, 2)
+        self.assertTrue(np.all(np.equal(thumbnail, [[0],
+                                                    [1]])))
+
+    def test_load_thumbnail(self):
+        thumbnail = pattern_index.load_thumbnail(self.index[1], 6)
+        self.assertEqual(thumbnail.shape, (6, 6))
+        self.assertEqual(thumbnail.sum(), 5 * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import asyncio
+import os
+import socket
+import tempfile
+import time
+from unittest import mock
+import numpy as np
+import life.grid_operations as grid_operations
+import life.server as server
+
+
+def reader_with(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        os.environ['NUMBA_DISABLE_JIT'] = '1'
+        self.blinker_1 = np.zeros((5, 5), dtype=np.int32)
+        self.blinker_1[1:4, 2] = 1
+        self.blinker_2 = np.zeros((5, 5), dtype=np.int32)
+        self.blinker_2[2, 1:4] = 1
+
+    async def test_keyframe(self):
+        frame = await server.read_frame(reader_with(server.encode_keyframe(self.blinker_1, 7)))
+        self.assertEqual(frame[:2], (server.KEYFRAME, 7))
+        self.assertTrue(np.all(np.equal(server.apply_frame(None, frame), self.blinker_1)))
+
+    async def test_delta(self):
+        frame = await server.read_frame(reader_with(server.encode_delta(self.blinker_1, self.blinker_2, 8)))
+        self.assertEqual(frame[:2], (server.DELTA, 8))
+        self.assertEqual(len(frame[2]), 4)
+        grid = server.apply_frame(self.blinker_1.copy(), frame)
+        self.assertTrue(np.all(np.equal(grid, self.blinker_2)))
+
+    async def test_watch(self):
+        data = (server.encode_delta(self.blinker_1, self.blinker_2, 0) +  # ignored before first keyframe
+                server.encode_keyframe(self.blinker_1, 1) +
+                server.encode_delta(self.blinker_1, self.blinker_2, 2))
+        generations = [(generation, grid.copy()) async for generation, grid in server.watch(reader_with(data))]
+        self.assertEqual([generation for generation, grid in generations], [1, 2])
+        self.assertTrue(np.all(np.equal(generations[1][1], self.blinker_2)))
+
+    async def test_broadcast_slow_client(self):
+        life_server = server.LifeServer(self.blinker_1, queue_size=3)
+        client = server.Client(None, life_server.queue_size)
+        life_server.clients.add(client)
+        life_server.broadcast(None)
+        for i in range(4):
+            previous_grid = life_server.grid
+            life_server.grid = grid_operations.update_grid(previous_grid, 5, 5)
+            life_server.generation += 1
+            life_server.broadcast(previous_grid)
+        frames = [client.queue.get_nowait()[:1] for i in range(client.queue.qsize())]
+        self.assertEqual(client.dropped, 3)
+        self.assertEqual(frames, [server.KEYFRAME, server.DELTA])
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "requires Unix sockets")
+    async def test_serve(self):
+        generations = 6
+        grid = grid_operations.create_random_grid(20, 30)
+        next_grid = grid
+        for i in range(generations):
+            next_grid = grid_operations.update_grid(next_grid, 20, 30)
+
+        async def watch(path):
+            reader, writer = await asyncio.open_unix_connection(path)
+            frames = [(generation, grid.copy()) async for generation, grid in server.watch(reader)]
+            writer.close()
+            return frames[-1]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "life.sock")
+            life_server = server.LifeServer(grid, gps=50, keyframe_interval=4)
+            serving = asyncio.create_task(life_server.serve(path, generations=generations))
+            while not os.path.exists(path):
+                await asyncio.sleep(0.01)
+            results = await asyncio.gather(watch(path), watch(path))
+            await serving
+
+        for generation, client_grid in results:
+            self.assertEqual(generation, generations)
+            self.assertTrue(np.all(np.equal(client_grid, next_grid)))
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "requires Unix sockets")
+    async def test_serve_stalled_client(self):
+        grid = grid_operations.create_random_grid(1000, 1000)  # keyframes bigger than socket buffers
+
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(server.grid_operations, "update_grid", lambda grid, h, w: 1 - grid):
+            path = os.path.join(directory, "life.sock")
+            life_server = server.LifeServer(grid, gps=20, keyframe_interval=1, close_timeout=0.5)
+            serving = asyncio.create_task(life_server.serve(path, generations=10))
+            while not os.path.exists(path):
+                await asyncio.sleep(0.01)
+            reader, writer = await asyncio.open_unix_connection(path)  # never reads
+            start = time.perf_counter()
+            await asyncio.wait_for(serving, 5)
+            self.assertLess(time.perf_counter() - start, 3)
+            self.assertEqual(life_server.clients, set())
+            writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()